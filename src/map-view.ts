@@ -11,7 +11,13 @@ import {
 } from 'obsidian';
 import { LngLatLike, Map, setRTLTextPlugin } from 'maplibre-gl';
 import type ObsidianMapsPlugin from './main';
-import { DEFAULT_MAP_HEIGHT, DEFAULT_MAP_CENTER, DEFAULT_MAP_ZOOM } from './map/constants';
+import {
+	DEFAULT_MAP_HEIGHT,
+	DEFAULT_MAP_CENTER,
+	DEFAULT_MAP_ZOOM,
+	DEFAULT_CLUSTER_RADIUS,
+	DEFAULT_CLUSTER_MAX_ZOOM,
+} from './map/constants';
 import { CustomZoomControl } from './map/controls/zoom-control';
 import { BackgroundSwitcherControl } from './map/controls/background-switcher';
 import { StyleManager } from './map/style';
@@ -24,6 +30,9 @@ interface MapConfig {
 	coordinatesProp: BasesPropertyId | null;
 	markerIconProp: BasesPropertyId | null;
 	markerColorProp: BasesPropertyId | null;
+	clusterMarkers: boolean;
+	clusterRadius: number;
+	clusterMaxZoom: number;
 	mapHeight: number;
 	defaultZoom: number;
 	center: [number, number];
@@ -87,6 +96,7 @@ export class MapView extends BasesView {
 
 	onunload() {
 		this.destroyMap();
+		this.markerManager.destroy();
 	}
 
 	/** Reduce flashing due to map re-rendering by debouncing while resizes are still ocurring. */
@@ -239,27 +249,29 @@ export class MapView extends BasesView {
 			const hasConfiguredCenter = this.mapConfig.center[0] !== 0 || this.mapConfig.center[1] !== 0;
 			const hasConfiguredZoom = this.config.get('defaultZoom') && Number.isNumber(this.config.get('defaultZoom'));
 
-			// Set center based on configuration
+			// Set center and zoom based on configuration
 			if (hasConfiguredCenter) {
 				this.map.setCenter([this.mapConfig.center[1], this.mapConfig.center[0]]); // MapLibre uses [lng, lat]
 			}
-			else {
-				const bounds = this.markerManager.getBounds();
-				if (bounds) {
-					this.map.setCenter(bounds.getCenter()); // Center on markers
-				}
-			}
-
-			// Set zoom based on configuration
 			if (hasConfiguredZoom) {
 				this.map.setZoom(this.mapConfig.defaultZoom); // Use configured zoom
 			}
-			else {
+			if (hasConfiguredCenter && hasConfiguredZoom) return;
+
+			// Otherwise center on the markers, which are only known once their coordinates are parsed
+			void this.markerManager.whenBoundsReady().then(() => {
+				if (!this.map || this.pendingMapState) return;
+
 				const bounds = this.markerManager.getBounds();
-				if (bounds) {
+				if (!bounds || bounds.isEmpty()) return;
+
+				if (!hasConfiguredCenter) {
+					this.map.setCenter(bounds.getCenter()); // Center on markers
+				}
+				if (!hasConfiguredZoom) {
 					this.map.fitBounds(bounds, { padding: 20 }); // Fit all markers
 				}
-			}
+			});
 		});
 
 		// Hide tooltip on the map element.
@@ -448,6 +460,12 @@ export class MapView extends BasesView {
 		const maxZoom = this.getNumericConfig('maxZoom', 18, 0, 24);
 		const defaultZoom = this.getNumericConfig('defaultZoom', DEFAULT_MAP_ZOOM, minZoom, maxZoom);
 
+		// Load marker clustering configuration
+		const clusterMarkers = this.config.get('clusterMarkers') === true;
+		const clusterRadius = this.getNumericConfig('clusterRadius', DEFAULT_CLUSTER_RADIUS, 10, 200);
+		// The markers source stops at zoom 18, so clusters must break apart below it (MapLibre ignores 0)
+		const clusterMaxZoom = this.getNumericConfig('clusterMaxZoom', DEFAULT_CLUSTER_MAX_ZOOM, 1, 17);
+
 		// Load center coordinates
 		const center = this.getCenterFromConfig();
 
@@ -493,6 +511,9 @@ export class MapView extends BasesView {
 			coordinatesProp,
 			markerIconProp,
 			markerColorProp,
+			clusterMarkers,
+			clusterRadius,
+			clusterMaxZoom,
 			mapHeight,
 			defaultZoom,
 			center,
@@ -571,6 +592,9 @@ export class MapView extends BasesView {
 			mapHeight: this.config.get('mapHeight'),
 			mapTiles: this.config.get('mapTiles'),
 			mapTilesDark: this.config.get('mapTilesDark'),
+			clusterMarkers: this.config.get('clusterMarkers'),
+			clusterRadius: this.config.get('clusterRadius'),
+			clusterMaxZoom: this.config.get('clusterMaxZoom'),
 		});
 	}
 
@@ -753,6 +777,30 @@ export class MapView extends BasesView {
 						filter: prop => !prop.startsWith('file.'),
 						placeholder: 'Property',
 					},
+					{
+						displayName: 'Cluster markers',
+						type: 'toggle',
+						key: 'clusterMarkers',
+						default: false,
+					},
+					{
+						displayName: 'Cluster radius',
+						type: 'slider',
+						key: 'clusterRadius',
+						min: 10,
+						max: 200,
+						step: 10,
+						default: DEFAULT_CLUSTER_RADIUS,
+					},
+					{
+						displayName: 'Maximum cluster zoom',
+						type: 'slider',
+						key: 'clusterMaxZoom',
+						min: 1,
+						max: 17,
+						step: 1,
+						default: DEFAULT_CLUSTER_MAX_ZOOM,
+					},
 				]
 			},
 			{
@@ -1,4 +1,11 @@
 export const DEFAULT_MAP_HEIGHT = 400;
 export const DEFAULT_MAP_CENTER: [number, number] = [0, 0];
 export const DEFAULT_MAP_ZOOM = 4;
+export const DEFAULT_CLUSTER_RADIUS = 50;
+export const DEFAULT_CLUSTER_MAX_ZOOM = 14;
 
+// When more than this share of the markers changed, the markers source is replaced instead of diffed
+export const MARKER_DIFF_MAX_RATIO = 0.5;
+
+// Number of composite marker images drawn at the same time
+export const MARKER_IMAGE_CONCURRENCY = 8;
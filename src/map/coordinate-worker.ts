@@ -0,0 +1,168 @@
+import { Value, NumberValue, StringValue, ListValue } from 'obsidian';
+
+/**
+ * A coordinate value reduced to plain data that can be posted to a worker:
+ * a "lat, lng" string, a pair of list items, or null when the value has no coordinates.
+ */
+export type RawCoordinate = string | [string | number | null, string | number | null] | null;
+
+export interface ParsedCoordinates {
+	/** Pairs of [lat, lng] in input order, NaN for values that are not valid coordinates */
+	coordinates: Float64Array;
+	/** [west, south, east, north] of the valid coordinates, or null if there are none */
+	bounds: [number, number, number, number] | null;
+}
+
+/**
+ * Reduces a coordinate property value to plain data without parsing any numbers.
+ */
+export function rawCoordinateFromValue(value: Value | null): RawCoordinate {
+	if (value instanceof ListValue) {
+		if (value.length() < 2) return null;
+		return [rawCoordinatePart(value.get(0)), rawCoordinatePart(value.get(1))];
+	}
+	if (value instanceof StringValue) {
+		return value.toString();
+	}
+	return null;
+}
+
+function rawCoordinatePart(value: unknown): string | number | null {
+	if (value instanceof NumberValue) {
+		return Number(value.toString());
+	}
+	if (value instanceof StringValue) {
+		return value.toString();
+	}
+	return null;
+}
+
+/**
+ * Parses, validates and bounds raw coordinates with the same rules as coordinateFromValue().
+ * This function is serialized into the worker, so it must not reference anything outside its body.
+ */
+function parseRawCoordinates(raw: RawCoordinate[]): ParsedCoordinates {
+	const parsePart = (part: string | number | null): number | null => {
+		const num = typeof part === 'string' ? parseFloat(part) : part;
+		return num === null || isNaN(num) ? null : num;
+	};
+
+	const coordinates = new Float64Array(raw.length * 2);
+	let west = Infinity;
+	let south = Infinity;
+	let east = -Infinity;
+	let north = -Infinity;
+
+	for (let i = 0; i < raw.length; i++) {
+		const value = raw[i];
+		let lat: number | null = null;
+		let lng: number | null = null;
+
+		if (typeof value === 'string') {
+			const parts = value.trim().split(',');
+			if (parts.length >= 2) {
+				lat = parsePart(parts[0].trim());
+				lng = parsePart(parts[1].trim());
+			}
+		}
+		else if (value) {
+			lat = parsePart(value[0]);
+			lng = parsePart(value[1]);
+		}
+
+		if (lat && lng && lat >= -90 && lat <= 90 && lng >= -180 && lng <= 180) {
+			coordinates[i * 2] = lat;
+			coordinates[i * 2 + 1] = lng;
+			west = Math.min(west, lng);
+			south = Math.min(south, lat);
+			east = Math.max(east, lng);
+			north = Math.max(north, lat);
+		}
+		else {
+			coordinates[i * 2] = NaN;
+			coordinates[i * 2 + 1] = NaN;
+		}
+	}
+
+	return {
+		coordinates,
+		bounds: west <= east ? [west, south, east, north] : null,
+	};
+}
+
+/**
+ * Runs coordinate parsing on a dedicated worker so large bases do not block the UI thread.
+ * Falls back to parsing on the main thread if the worker cannot be started.
+ */
+export class CoordinateWorker {
+	private static workerURL: string | null = null;
+	private static workerFailed = false;
+
+	private worker: Worker | null = null;
+	private nextRequestId = 0;
+	private requests: Map<number, { raw: RawCoordinate[]; resolve: (result: ParsedCoordinates) => void }> = new Map();
+
+	async parse(raw: RawCoordinate[]): Promise<ParsedCoordinates> {
+		const worker = this.getWorker();
+		if (!worker) {
+			return parseRawCoordinates(raw);
+		}
+
+		const id = this.nextRequestId++;
+		return new Promise(resolve => {
+			this.requests.set(id, { raw, resolve });
+			worker.postMessage({ id, raw });
+		});
+	}
+
+	terminate(): void {
+		if (this.worker) {
+			this.worker.terminate();
+			this.worker = null;
+		}
+
+		// Finish any outstanding requests on the main thread
+		for (const { raw, resolve } of this.requests.values()) {
+			resolve(parseRawCoordinates(raw));
+		}
+		this.requests.clear();
+	}
+
+	private getWorker(): Worker | null {
+		if (this.worker) return this.worker;
+		if (CoordinateWorker.workerFailed) return null;
+
+		try {
+			if (!CoordinateWorker.workerURL) {
+				// Create a blob URL from the serialized parser, in the same way as the RTL plugin
+				const code = `const parseRawCoordinates = ${parseRawCoordinates.toString()};
+self.onmessage = (event) => {
+	const result = parseRawCoordinates(event.data.raw);
+	self.postMessage({ id: event.data.id, result }, [result.coordinates.buffer]);
+};`;
+				const blob = new Blob([code], { type: 'application/javascript' });
+				CoordinateWorker.workerURL = URL.createObjectURL(blob);
+			}
+
+			const worker = new Worker(CoordinateWorker.workerURL);
+			worker.onmessage = (event: MessageEvent<{ id: number; result: ParsedCoordinates }>) => {
+				const request = this.requests.get(event.data.id);
+				if (request) {
+					this.requests.delete(event.data.id);
+					request.resolve(event.data.result);
+				}
+			};
+			worker.onerror = (event: ErrorEvent) => {
+				console.warn('Coordinate worker failed, parsing on the main thread instead:', event.message);
+				CoordinateWorker.workerFailed = true;
+				this.terminate();
+			};
+			this.worker = worker;
+			return worker;
+		} catch (error) {
+			console.warn('Failed to start coordinate worker:', error);
+			CoordinateWorker.workerFailed = true;
+			return null;
+		}
+	}
+}
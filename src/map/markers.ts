@@ -1,16 +1,40 @@
 import { App, BasesEntry, BasesPropertyId, Keymap, Menu, setIcon } from 'obsidian';
-import { Map, LngLatBounds, GeoJSONSource, MapLayerMouseEvent } from 'maplibre-gl';
-import { MapMarker, MapMarkerProperties } from './types';
-import { coordinateFromValue } from './utils';
+import { Map as MapLibreMap, LngLatBounds, GeoJSONSource, MapGeoJSONFeature, MapLayerMouseEvent } from 'maplibre-gl';
+import { MapMarker, MapMarkerProperties, MapMarkerStyle } from './types';
+import { CoordinateWorker, RawCoordinate, rawCoordinateFromValue } from './coordinate-worker';
 import { PopupManager } from './popup';
+import { MARKER_DIFF_MAX_RATIO, MARKER_IMAGE_CONCURRENCY } from './constants';
+
+const CLUSTER_IMAGE_PREFIX = 'cluster-';
+
+function getCompositeImageKey(icon: string | null, color: string): string {
+	return `marker-${icon || 'dot'}-${color.replace(/[^a-zA-Z0-9]/g, '')}`;
+}
+
+// Plain dot in the accent color, shown while a marker's own image is still being drawn
+const DEFAULT_MARKER_STYLE: MapMarkerStyle = {
+	icon: null,
+	color: 'var(--bases-map-marker-background)',
+	imageKey: getCompositeImageKey(null, 'var(--bases-map-marker-background)'),
+};
 
 export class MarkerManager {
-	private map: Map | null = null;
+	private map: MapLibreMap | null = null;
 	private app: App;
 	private mapEl: HTMLElement;
-	private markers: MapMarker[] = [];
+	private markers: Map<string, MapMarker> = new Map(); // Keyed by file path
+	private markersById: Map<number, MapMarker> = new Map();
+	private nextMarkerId = 1; // Clustered sources drop falsy feature ids, so never use 0
+	private clusterOptions: string | null = null;
+	private interactionsMap: MapLibreMap | null = null; // Map that the marker listeners are registered on
+	private pendingUpdate: Promise<void> = Promise.resolve();
 	private bounds: LngLatBounds | null = null;
+	private boundsReady: Promise<void>;
+	private resolveBoundsReady: () => void = () => {};
 	private loadedIcons: Set<string> = new Set();
+	private loadingIcons: Map<string, Promise<void>> = new Map();
+	private imageSwapScheduled = false;
+	private coordinateWorker = new CoordinateWorker();
 	private popupManager: PopupManager;
 	private onOpenFile: (path: string, newLeaf: boolean) => void;
 	private getData: () => any;
@@ -33,90 +57,208 @@ export class MarkerManager {
 		this.getData = getData;
 		this.getMapConfig = getMapConfig;
 		this.getDisplayName = getDisplayName;
+		this.boundsReady = new Promise(resolve => this.resolveBoundsReady = resolve);
 	}
 
-	setMap(map: Map | null): void {
+	setMap(map: MapLibreMap | null): void {
 		this.map = map;
 	}
 
+	destroy(): void {
+		this.coordinateWorker.terminate();
+	}
+
 	getMarkers(): MapMarker[] {
-		return this.markers;
+		return Array.from(this.markers.values());
 	}
 
 	getBounds(): LngLatBounds | null {
 		return this.bounds;
 	}
 
+	/**
+	 * Resolves once the first marker update has parsed its coordinates and set the bounds.
+	 */
+	whenBoundsReady(): Promise<void> {
+		return this.boundsReady;
+	}
+
 	clearLoadedIcons(): void {
 		this.loadedIcons.clear();
+		// Images still being drawn use the old theme, so they are discarded when they finish
+		this.loadingIcons = new Map();
 	}
 
 	async updateMarkers(data: { data: BasesEntry[] }): Promise<void> {
+		// Every update is a diff against the previous one, so updates must not overlap
+		const update = this.pendingUpdate.then(() => this.applyMarkerUpdate(data));
+		this.pendingUpdate = update.catch(() => {});
+		return update;
+	}
+
+	private async applyMarkerUpdate(data: { data: BasesEntry[] }): Promise<void> {
 		const mapConfig = this.getMapConfig();
 		if (!this.map || !data || !mapConfig || !mapConfig.coordinatesProp) {
 			return;
 		}
 
-		// Collect valid marker data
-		const validMarkers: MapMarker[] = [];
+		// Collect raw coordinate values, leaving the parsing to the coordinate worker
+		const entries: BasesEntry[] = [];
+		const rawCoordinates: RawCoordinate[] = [];
+		const paths = new Set<string>();
 		for (const entry of data.data) {
-			if (!entry) continue;
+			if (!entry || paths.has(entry.file.path)) continue;
+			paths.add(entry.file.path);
 
-			let coordinates: [number, number] | null = null;
+			let rawCoordinate: RawCoordinate = null;
 			try {
-				const value = entry.getValue(mapConfig.coordinatesProp);
-				coordinates = coordinateFromValue(value);
+				rawCoordinate = rawCoordinateFromValue(entry.getValue(mapConfig.coordinatesProp));
 			}
 			catch (error) {
 				console.error(`Error extracting coordinates for ${entry.file.name}:`, error);
 			}
+			if (rawCoordinate === null) continue;
 
-			if (coordinates) {
-				validMarkers.push({
-					entry,
-					coordinates,
-				});
+			entries.push(entry);
+			rawCoordinates.push(rawCoordinate);
+		}
+
+		const parsed = await this.coordinateWorker.parse(rawCoordinates);
+		if (!this.map) return;
+
+		// Diff the valid markers against the previous markers by file path
+		const previousMarkers = this.markers;
+		const markers = new Map<string, MapMarker>();
+		const markersById = new Map<number, MapMarker>();
+		const added: MapMarker[] = [];
+		const changed: MapMarker[] = [];
+		const styles = new Map<string, MapMarkerStyle>();
+		for (let i = 0; i < entries.length; i++) {
+			const lat = parsed.coordinates[i * 2];
+			const lng = parsed.coordinates[i * 2 + 1];
+			if (isNaN(lat)) continue;
+
+			const entry = entries[i];
+			const path = entry.file.path;
+			const style = this.resolveMarkerStyle(entry, mapConfig, styles);
+			const previous = previousMarkers.get(path);
+			const marker: MapMarker = {
+				id: previous ? previous.id : this.nextMarkerId++,
+				entry,
+				coordinates: [lat, lng],
+				style,
+				image: this.getShownImage(style),
+			};
+			markers.set(path, marker);
+			markersById.set(marker.id, marker);
+
+			if (!previous) {
+				added.push(marker);
+			}
+			else if (previous.coordinates[0] !== lat
+				|| previous.coordinates[1] !== lng
+				|| previous.image !== marker.image) {
+				changed.push(marker);
 			}
 		}
 
-		this.markers = validMarkers;
+		const removed: number[] = [];
+		for (const [path, marker] of previousMarkers) {
+			if (!markers.has(path)) {
+				removed.push(marker.id);
+			}
+		}
 
-		// Calculate bounds for all markers
-		const bounds = this.bounds = new LngLatBounds();
-		validMarkers.forEach(markerData => {
-			const [lat, lng] = markerData.coordinates;
-			bounds.extend([lng, lat]);
-		});
+		this.markers = markers;
+		this.markersById = markersById;
+		this.bounds = parsed.bounds ? new LngLatBounds(parsed.bounds) : new LngLatBounds();
+		this.resolveBoundsReady();
 
-		// Load all custom icons and create GeoJSON features
-		await this.loadCustomIcons(validMarkers);
-		const features = this.createGeoJSONFeatures(validMarkers);
+		// Only the default pin is needed up front, custom images are swapped in as they are drawn
+		await this.loadMarkerImage(DEFAULT_MARKER_STYLE);
+		if (!this.map) return;
+		this.loadCustomIcons(Array.from(markers.values()));
+
+		this.refreshClusterImages();
 
 		// Update or create the markers source
+		const clusterOptions = {
+			cluster: Boolean(mapConfig.clusterMarkers),
+			clusterRadius: mapConfig.clusterRadius,
+			clusterMaxZoom: mapConfig.clusterMaxZoom,
+		};
+		const clusterKey = JSON.stringify(clusterOptions);
 		const source = this.map.getSource('markers') as GeoJSONSource | undefined;
-		if (source) {
-			source.setData({
-				type: 'FeatureCollection',
-				features,
-			});
-		} else {
-			// Add source if it doesn't exist
+		if (!source) {
+			// The source is missing on a new map and after a style change, so add every marker
 			this.map.addSource('markers', {
 				type: 'geojson',
 				data: {
 					type: 'FeatureCollection',
-					features,
+					features: this.createGeoJSONFeatures(Array.from(markers.values())),
 				},
+				...clusterOptions,
 			});
+			this.clusterOptions = clusterKey;
 
 			// Add layers for markers (icon + pin)
 			this.addMarkerLayers();
-			this.setupMarkerInteractions();
+
+			// Layer listeners belong to the map and survive style changes, so only register them once
+			if (this.interactionsMap !== this.map) {
+				this.setupMarkerInteractions();
+				this.interactionsMap = this.map;
+			}
+			return;
+		}
+
+		if (this.clusterOptions !== clusterKey) {
+			source.setClusterOptions(clusterOptions);
+			this.clusterOptions = clusterKey;
+		}
+
+		if (added.length + changed.length + removed.length > markers.size * MARKER_DIFF_MAX_RATIO) {
+			source.setData({
+				type: 'FeatureCollection',
+				features: this.createGeoJSONFeatures(Array.from(markers.values())),
+			});
+		}
+		else if (added.length > 0 || changed.length > 0 || removed.length > 0) {
+			// Only send the markers that changed, so that editing a single note stays cheap
+			source.updateData({
+				add: this.createGeoJSONFeatures(added),
+				update: changed.map(marker => {
+					const [lat, lng] = marker.coordinates;
+					const newGeometry: GeoJSON.Point = { type: 'Point', coordinates: [lng, lat] };
+					return {
+						id: marker.id,
+						newGeometry,
+						addOrUpdateProperties: [{ key: 'icon', value: marker.image }],
+					};
+				}),
+				remove: removed,
+			});
 		}
 	}
 
-	private getCustomIcon(entry: BasesEntry): string | null {
-		const mapConfig = this.getMapConfig();
+	/**
+	 * Resolves the icon, color and image key of an entry once per update.
+	 * Entries with the same icon and color share a single style object.
+	 */
+	private resolveMarkerStyle(entry: BasesEntry, mapConfig: any, styles: Map<string, MapMarkerStyle>): MapMarkerStyle {
+		const icon = this.getCustomIcon(entry, mapConfig);
+		const color = this.getCustomColor(entry, mapConfig) || 'var(--bases-map-marker-background)';
+		const cacheKey = `${icon || ''}\n${color}`;
+
+		let style = styles.get(cacheKey);
+		if (!style) {
+			style = { icon, color, imageKey: getCompositeImageKey(icon, color) };
+			styles.set(cacheKey, style);
+		}
+		return style;
+	}
+
+	private getCustomIcon(entry: BasesEntry, mapConfig: any): string | null {
 		if (!mapConfig || !mapConfig.markerIconProp) return null;
 
 		try {
@@ -140,8 +282,7 @@ export class MarkerManager {
 		}
 	}
 
-	private getCustomColor(entry: BasesEntry): string | null {
-		const mapConfig = this.getMapConfig();
+	private getCustomColor(entry: BasesEntry, mapConfig: any): string | null {
 		if (!mapConfig || !mapConfig.markerColorProp) return null;
 
 		try {
@@ -162,48 +303,94 @@ export class MarkerManager {
 		}
 	}
 
-	private async loadCustomIcons(markers: MapMarker[]): Promise<void> {
+	private getShownImage(style: MapMarkerStyle): string {
+		// Images from before a theme change stay in place until they are redrawn,
+		// so only images that were never drawn fall back to the default pin
+		if (this.loadedIcons.has(style.imageKey) || this.map?.hasImage(style.imageKey)) {
+			return style.imageKey;
+		}
+		return DEFAULT_MARKER_STYLE.imageKey;
+	}
+
+	private loadCustomIcons(markers: MapMarker[]): void {
 		if (!this.map) return;
 
 		// Collect all unique icon+color combinations that need to be loaded
-		const compositeImagesToLoad: Array<{ icon: string | null; color: string }> = [];
-		const uniqueKeys = new Set<string>();
-		
+		const compositeImagesToLoad = new Map<string, MapMarkerStyle>();
 		for (const markerData of markers) {
-			const icon = this.getCustomIcon(markerData.entry);
-			const color = this.getCustomColor(markerData.entry) || 'var(--bases-map-marker-background)';
-			const compositeKey = this.getCompositeImageKey(icon, color);
-			
-			if (!this.loadedIcons.has(compositeKey)) {
-				if (!uniqueKeys.has(compositeKey)) {
-					compositeImagesToLoad.push({ icon, color });
-					uniqueKeys.add(compositeKey);
-				}
+			const { imageKey } = markerData.style;
+			if (!this.loadedIcons.has(imageKey) && !this.loadingIcons.has(imageKey)) {
+				compositeImagesToLoad.set(imageKey, markerData.style);
 			}
 		}
 
-		// Create composite images for each unique icon+color combination
-		for (const { icon, color } of compositeImagesToLoad) {
-			try {
-				const compositeKey = this.getCompositeImageKey(icon, color);
-				const img = await this.createCompositeMarkerImage(icon, color);
-				
-				if (this.map) {
-					// Force update of the image on theme change
-					if (this.map.hasImage(compositeKey)) {
-						this.map.removeImage(compositeKey);
-					}
-					this.map.addImage(compositeKey, img);
-					this.loadedIcons.add(compositeKey);
-				}
-			} catch (error) {
-				console.warn(`Failed to create composite marker for icon ${icon}:`, error);
+		// Create composite images concurrently, a limited number at a time
+		const styles = Array.from(compositeImagesToLoad.values());
+		let next = 0;
+		const loadNext = async (): Promise<void> => {
+			while (next < styles.length) {
+				await this.loadMarkerImage(styles[next++]);
+				this.scheduleImageSwap();
 			}
+		};
+		for (let i = 0; i < Math.min(MARKER_IMAGE_CONCURRENCY, styles.length); i++) {
+			void loadNext();
 		}
 	}
 
-	private getCompositeImageKey(icon: string | null, color: string): string {
-		return `marker-${icon || 'dot'}-${color.replace(/[^a-zA-Z0-9]/g, '')}`;
+	private loadMarkerImage(style: MapMarkerStyle): Promise<void> {
+		if (this.loadedIcons.has(style.imageKey)) return Promise.resolve();
+
+		const loadingIcons = this.loadingIcons;
+		let loading = loadingIcons.get(style.imageKey);
+		if (!loading) {
+			loading = this.createCompositeMarkerImage(style.icon, style.color)
+				.then(img => {
+					if (this.map && loadingIcons === this.loadingIcons) {
+						// Force update of the image on theme change
+						if (this.map.hasImage(style.imageKey)) {
+							this.map.removeImage(style.imageKey);
+						}
+						this.map.addImage(style.imageKey, img);
+						this.loadedIcons.add(style.imageKey);
+					}
+				})
+				.catch(error => {
+					console.warn(`Failed to create composite marker for icon ${style.icon}:`, error);
+				})
+				.finally(() => loadingIcons.delete(style.imageKey));
+			loadingIcons.set(style.imageKey, loading);
+		}
+		return loading;
+	}
+
+	private scheduleImageSwap(): void {
+		if (this.imageSwapScheduled) return;
+		this.imageSwapScheduled = true;
+
+		// Batch the images that finish within a frame into a single source update
+		window.requestAnimationFrame(() => {
+			this.imageSwapScheduled = false;
+			const update = this.pendingUpdate.then(() => this.swapLoadedImages());
+			this.pendingUpdate = update.catch(() => {});
+		});
+	}
+
+	private swapLoadedImages(): void {
+		const source = this.map?.getSource('markers') as GeoJSONSource | undefined;
+		if (!source) return;
+
+		const update: Array<{ id: number; addOrUpdateProperties: Array<{ key: string; value: string }> }> = [];
+		for (const marker of this.markers.values()) {
+			if (marker.image !== marker.style.imageKey && this.loadedIcons.has(marker.style.imageKey)) {
+				marker.image = marker.style.imageKey;
+				update.push({ id: marker.id, addOrUpdateProperties: [{ key: 'icon', value: marker.image }] });
+			}
+		}
+
+		if (update.length > 0) {
+			source.updateData({ update });
+		}
 	}
 
 	private resolveColor(color: string): string {
@@ -315,20 +502,71 @@ export class MarkerManager {
 		});
 	}
 
+	private createClusterImage(label: string): ImageData {
+		const resolvedColor = this.resolveColor('var(--bases-map-marker-background)');
+		const resolvedTextColor = this.resolveColor('var(--bases-map-marker-icon-color)');
+
+		// Longer counts get a larger bubble so the label always fits
+		const scale = 2;
+		const radius = (12 + label.length * 3) * scale;
+		const haloWidth = 4 * scale;
+		const size = (radius + haloWidth) * 2;
+		const canvas = document.createElement('canvas');
+		canvas.width = size;
+		canvas.height = size;
+		const ctx = canvas.getContext('2d');
+
+		if (!ctx) {
+			throw new Error('Failed to get canvas context');
+		}
+
+		const center = size / 2;
+
+		// Draw a translucent halo behind the bubble
+		ctx.globalAlpha = 0.35;
+		ctx.fillStyle = resolvedColor;
+		ctx.beginPath();
+		ctx.arc(center, center, radius + haloWidth, 0, 2 * Math.PI);
+		ctx.fill();
+		ctx.globalAlpha = 1;
+
+		ctx.beginPath();
+		ctx.arc(center, center, radius, 0, 2 * Math.PI);
+		ctx.fill();
+
+		// Draw the count on the canvas, since raster styles have no glyphs for text layers
+		ctx.fillStyle = resolvedTextColor;
+		ctx.font = `600 ${11 * scale}px ${getComputedStyle(document.body).fontFamily}`;
+		ctx.textAlign = 'center';
+		ctx.textBaseline = 'middle';
+		ctx.fillText(label, center, center);
+
+		return ctx.getImageData(0, 0, size, size);
+	}
+
+	private refreshClusterImages(): void {
+		if (!this.map) return;
+
+		// Cluster images are drawn on demand, so redraw the ones that predate a theme change
+		for (const key of this.map.listImages()) {
+			if (key.startsWith(CLUSTER_IMAGE_PREFIX) && !this.loadedIcons.has(key)) {
+				this.map.updateImage(key, this.createClusterImage(key.slice(CLUSTER_IMAGE_PREFIX.length)));
+				this.loadedIcons.add(key);
+			}
+		}
+	}
+
 	private createGeoJSONFeatures(markers: MapMarker[]): GeoJSON.Feature[] {
-		return markers.map((markerData, index) => {
+		return markers.map(markerData => {
 			const [lat, lng] = markerData.coordinates;
-			const icon = this.getCustomIcon(markerData.entry);
-			const color = this.getCustomColor(markerData.entry) || 'var(--bases-map-marker-background)';
-			const compositeKey = this.getCompositeImageKey(icon, color);
 
 			const properties: MapMarkerProperties = {
-				entryIndex: index,
-				icon: compositeKey, // Use composite image key
+				icon: markerData.image, // Use composite image key
 			};
 
 			return {
 				type: 'Feature',
+				id: markerData.id, // Stable id used to diff updates
 				geometry: {
 					type: 'Point',
 					coordinates: [lng, lat],
@@ -338,6 +576,10 @@ export class MarkerManager {
 		});
 	}
 
+	private getFeatureMarker(feature: MapGeoJSONFeature): MapMarker | undefined {
+		return typeof feature.id === 'number' ? this.markersById.get(feature.id) : undefined;
+	}
+
 	private addMarkerLayers(): void {
 		if (!this.map) return;
 
@@ -346,6 +588,7 @@ export class MarkerManager {
 			id: 'marker-pins',
 			type: 'symbol',
 			source: 'markers',
+			filter: ['!', ['has', 'point_count']],
 			layout: {
 				'icon-image': ['get', 'icon'],
 				'icon-size': [
@@ -362,27 +605,62 @@ export class MarkerManager {
 				'icon-padding': 0,
 			},
 		});
+
+		// Cluster bubbles only match features while clustering is enabled
+		this.map.addLayer({
+			id: 'marker-clusters',
+			type: 'symbol',
+			source: 'markers',
+			filter: ['has', 'point_count'],
+			layout: {
+				'icon-image': ['concat', CLUSTER_IMAGE_PREFIX, ['get', 'point_count_abbreviated']],
+				'icon-allow-overlap': true,
+				'icon-ignore-placement': true,
+				'icon-padding': 0,
+			},
+		});
 	}
 
 	private setupMarkerInteractions(): void {
 		if (!this.map) return;
 
-		// Change cursor on hover
-		this.map.on('mouseenter', 'marker-pins', () => {
-			if (this.map) this.map.getCanvas().style.cursor = 'pointer';
+		// Draw cluster bubbles for counts the first time they are needed
+		this.map.on('styleimagemissing', (e: { id: string }) => {
+			if (!this.map || !e.id.startsWith(CLUSTER_IMAGE_PREFIX) || this.map.hasImage(e.id)) return;
+			this.map.addImage(e.id, this.createClusterImage(e.id.slice(CLUSTER_IMAGE_PREFIX.length)), { pixelRatio: 2 });
+			this.loadedIcons.add(e.id);
 		});
 
-		this.map.on('mouseleave', 'marker-pins', () => {
-			if (this.map) this.map.getCanvas().style.cursor = '';
+		// Change cursor on hover
+		for (const layerId of ['marker-pins', 'marker-clusters']) {
+			this.map.on('mouseenter', layerId, () => {
+				if (this.map) this.map.getCanvas().style.cursor = 'pointer';
+			});
+
+			this.map.on('mouseleave', layerId, () => {
+				if (this.map) this.map.getCanvas().style.cursor = '';
+			});
+		}
+
+		// Handle click on a cluster to zoom in until it splits apart
+		this.map.on('click', 'marker-clusters', (e: MapLayerMouseEvent) => {
+			if (!e.features || e.features.length === 0) return;
+			const feature = e.features[0];
+			const source = this.map?.getSource('markers') as GeoJSONSource | undefined;
+			if (!source || feature.geometry.type !== 'Point') return;
+
+			const center = feature.geometry.coordinates as [number, number];
+			source.getClusterExpansionZoom(feature.properties.cluster_id)
+				.then(zoom => this.map?.easeTo({ center, zoom }))
+				.catch(error => console.warn('Failed to expand marker cluster:', error));
 		});
 
 		// Handle hover to show popup
 		this.map.on('mouseenter', 'marker-pins', (e: MapLayerMouseEvent) => {
 			if (!e.features || e.features.length === 0) return;
 			const feature = e.features[0];
-			const entryIndex = feature.properties?.entryIndex;
-			if (entryIndex !== undefined && this.markers[entryIndex]) {
-				const markerData = this.markers[entryIndex];
+			const markerData = this.getFeatureMarker(feature);
+			if (markerData) {
 				const data = this.getData();
 				const mapConfig = this.getMapConfig();
 				if (data && data.properties && mapConfig) {
@@ -408,9 +686,8 @@ export class MarkerManager {
 		this.map.on('click', 'marker-pins', (e: MapLayerMouseEvent) => {
 			if (!e.features || e.features.length === 0) return;
 			const feature = e.features[0];
-			const entryIndex = feature.properties?.entryIndex;
-			if (entryIndex !== undefined && this.markers[entryIndex]) {
-				const markerData = this.markers[entryIndex];
+			const markerData = this.getFeatureMarker(feature);
+			if (markerData) {
 				const newLeaf = e.originalEvent ? Boolean(Keymap.isModEvent(e.originalEvent)) : false;
 				this.onOpenFile(markerData.entry.file.path, newLeaf);
 			}
@@ -422,9 +699,8 @@ export class MarkerManager {
 			if (!e.features || e.features.length === 0) return;
 			
 			const feature = e.features[0];
-			const entryIndex = feature.properties?.entryIndex;
-			if (entryIndex !== undefined && this.markers[entryIndex]) {
-				const markerData = this.markers[entryIndex];
+			const markerData = this.getFeatureMarker(feature);
+			if (markerData) {
 				const [lat, lng] = markerData.coordinates;
 				const file = markerData.entry.file;
 				
@@ -454,9 +730,8 @@ export class MarkerManager {
 		this.map.on('mouseover', 'marker-pins', (e: MapLayerMouseEvent) => {
 			if (!e.features || e.features.length === 0) return;
 			const feature = e.features[0];
-			const entryIndex = feature.properties?.entryIndex;
-			if (entryIndex !== undefined && this.markers[entryIndex]) {
-				const markerData = this.markers[entryIndex];
+			const markerData = this.getFeatureMarker(feature);
+			if (markerData) {
 				this.app.workspace.trigger('hover-link', {
 					event: e.originalEvent,
 					source: 'bases',
@@ -1,12 +1,19 @@
 import { BasesEntry } from 'obsidian';
 
 export interface MapMarker {
+	id: number; // Stable feature id, kept for as long as the file path stays the same
 	entry: BasesEntry;
 	coordinates: [number, number];
+	style: MapMarkerStyle;
+	image: string; // Image key shown on the map, the default pin until the style image is ready
+}
+
+export interface MapMarkerStyle {
+	icon: string | null; // Lucide icon name, or null for a plain dot
+	color: string;
+	imageKey: string; // Composite image key combining icon and color
 }
 
 export interface MapMarkerProperties {
-	entryIndex: number;
 	icon: string; // Composite image key combining icon and color
 }
-
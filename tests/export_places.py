@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Export the markers of a vault to GeoJSON, newline-delimited GeoJSON or FlatGeobuf.
+
+Notes are read in a process pool and their coordinates are extracted with the
+same rules as coordinateFromValue() in src/map/utils.ts, so the export
+contains exactly the markers a map view of the vault shows.
+
+FlatGeobuf files get a packed Hilbert R-tree index, so other tools can run
+bounding box queries without reading every feature. Writing the index needs
+all features in memory, the other formats are written as notes are read.
+
+Usage:
+    python export_places.py VAULT OUTPUT [options]
+
+Arguments:
+    VAULT: Folder to export, e.g. a vault or tests/generated_places
+    OUTPUT: File to write
+
+Options:
+    --format FORMAT: Output format (default: from the OUTPUT extension)
+        geojson:    a FeatureCollection, .geojson and .json
+        geojsonseq: one Feature per line, .geojsonl, .geojsons, .ndjson and .jsonl
+        flatgeobuf: FlatGeobuf with a spatial index, .fgb
+    --coordinates NAME: Coordinates property (default: coordinates)
+    --icon NAME: Marker icon property (default: icon)
+    --color NAME: Marker color property (default: color)
+    --property NAME: Also export this property as a string. Can be repeated
+    --workers N: Number of worker processes (default: number of CPUs)
+
+Every feature has the properties path (relative to the vault), name, icon and
+color, followed by the properties requested with --property.
+"""
+
+import argparse
+import json
+import math
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from scan_vault import (BATCH_SIZE, coordinate_from_value, find_notes, read_frontmatter,
+                        value_is_truthy, value_to_string)
+
+OUTPUT_FORMATS = ["geojson", "geojsonseq", "flatgeobuf"]
+OUTPUT_EXTENSIONS = {
+    ".geojson": "geojson",
+    ".json": "geojson",
+    ".geojsonl": "geojsonseq",
+    ".geojsons": "geojsonseq",
+    ".ndjson": "geojsonseq",
+    ".jsonl": "geojsonseq",
+    ".fgb": "flatgeobuf",
+}
+
+FLATGEOBUF_MAGIC = b"fgb\x03fgb\x00"
+FLATGEOBUF_POINT = 1
+FLATGEOBUF_STRING = 11
+# Children per node of the packed R-tree, kept at the FlatGeobuf reference default
+DEFAULT_NODE_SIZE = 16
+HILBERT_MAX = (1 << 16) - 1
+
+SCALAR_FORMATS = {
+    "bool": "<?",
+    "ubyte": "<B",
+    "ushort": "<H",
+    "int": "<i",
+    "uint": "<I",
+    "ulong": "<Q",
+    "double": "<d",
+}
+
+
+def pad(out, alignment, offset=0):
+    """Pad a buffer with zeros so that its length plus offset is a multiple of alignment."""
+    out.extend(bytes(-(len(out) + offset) % alignment))
+
+
+def write_flatbuffer_object(out, field):
+    """Append a string, vector or table to a flatbuffer and return its position."""
+    kind = field[0]
+    if kind == "string":
+        data = field[1].encode("utf-8")
+        pad(out, 4)
+        position = len(out)
+        out.extend(struct.pack("<I", len(data)) + data + b"\0")
+        return position
+    if kind == "table":
+        return write_flatbuffer_table(out, field[1])
+
+    element_kind, values = field[1], field[2]
+    if element_kind == "table":
+        pad(out, 4)
+        position = len(out)
+        out.extend(struct.pack("<I", len(values)) + bytes(4 * len(values)))
+        for index, fields in enumerate(values):
+            slot = position + 4 + 4 * index
+            struct.pack_into("<I", out, slot, write_flatbuffer_table(out, fields) - slot)
+        return position
+
+    # Scalar vectors are aligned so that their elements are aligned after the length
+    element_format = SCALAR_FORMATS[element_kind]
+    pad(out, max(4, struct.calcsize(element_format)), offset=4)
+    position = len(out)
+    out.extend(struct.pack("<I", len(values)))
+    out.extend(values if element_kind == "ubyte" else struct.pack(f"<{len(values)}{element_format[1]}", *values))
+    return position
+
+
+def write_flatbuffer_table(out, fields):
+    """Append a table to a flatbuffer and return its position.
+
+    fields is a list indexed by field id, with None for absent fields and
+    (kind, value) tuples otherwise. The vtable is written before the table and
+    strings, vectors and subtables after it, as flatbuffers only allow forward
+    offsets to them.
+    """
+    pad(out, 2)
+    vtable_position = len(out)
+    out.extend(bytes(4 + 2 * len(fields)))
+
+    pad(out, 4)
+    table_position = len(out)
+    out.extend(struct.pack("<i", table_position - vtable_position))
+
+    children = []
+    for index, field in enumerate(fields):
+        if field is None:
+            continue
+        kind = field[0]
+        size = struct.calcsize(SCALAR_FORMATS[kind]) if kind in SCALAR_FORMATS else 4
+        pad(out, size)
+        struct.pack_into("<H", out, vtable_position + 4 + 2 * index, len(out) - table_position)
+        if kind in SCALAR_FORMATS:
+            out.extend(struct.pack(SCALAR_FORMATS[kind], field[1]))
+        else:
+            children.append((len(out), field))
+            out.extend(bytes(4))
+    struct.pack_into("<HH", out, vtable_position, 4 + 2 * len(fields), len(out) - table_position)
+
+    for slot, field in children:
+        struct.pack_into("<I", out, slot, write_flatbuffer_object(out, field) - slot)
+    return table_position
+
+
+def flatbuffer(fields):
+    """Encode a flatbuffer with a root table, prefixed with its size like FlatGeobuf expects."""
+    out = bytearray(4)
+    struct.pack_into("<I", out, 0, write_flatbuffer_table(out, fields))
+    return struct.pack("<I", len(out)) + bytes(out)
+
+
+def flatgeobuf_feature(lon, lat, values):
+    """Encode a point feature with string column values, None values are left out."""
+    properties = bytearray()
+    for column, value in enumerate(values):
+        if value is not None:
+            data = value.encode("utf-8")
+            properties.extend(struct.pack("<HI", column, len(data)) + data)
+    geometry = [None, ("vector", "double", [lon, lat])]
+    return flatbuffer([("table", geometry), ("vector", "ubyte", bytes(properties))])
+
+
+def flatgeobuf_header(columns, count, envelope):
+    """Encode the FlatGeobuf header of a point layer in WGS 84 with string columns."""
+    return flatbuffer([
+        ("string", "places"),
+        ("vector", "double", envelope) if envelope else None,
+        ("ubyte", FLATGEOBUF_POINT),
+        None, None, None, None,
+        ("vector", "table", [[("string", column), ("ubyte", FLATGEOBUF_STRING)] for column in columns]),
+        ("ulong", count),
+        # FlatGeobuf files without features have no index
+        ("ushort", DEFAULT_NODE_SIZE if count else 0),
+        ("table", [("string", "EPSG"), ("int", 4326)]),
+    ])
+
+
+def hilbert(x, y):
+    """Get the position of a point on a 16-bit Hilbert curve, like flatbush and FlatGeobuf."""
+    a = x ^ y
+    b = 0xFFFF ^ a
+    c = 0xFFFF ^ (x | y)
+    d = x & (y ^ 0xFFFF)
+
+    A = a | (b >> 1)
+    B = (a >> 1) ^ a
+    C = ((c >> 1) ^ (b & (d >> 1))) ^ c
+    D = ((a & (c >> 1)) ^ (d >> 1)) ^ d
+
+    a, b, c, d = A, B, C, D
+    A = (a & (a >> 2)) ^ (b & (b >> 2))
+    B = (a & (b >> 2)) ^ (b & ((a ^ b) >> 2))
+    C ^= (a & (c >> 2)) ^ (b & (d >> 2))
+    D ^= (b & (c >> 2)) ^ ((a ^ b) & (d >> 2))
+
+    a, b, c, d = A, B, C, D
+    A = (a & (a >> 4)) ^ (b & (b >> 4))
+    B = (a & (b >> 4)) ^ (b & ((a ^ b) >> 4))
+    C ^= (a & (c >> 4)) ^ (b & (d >> 4))
+    D ^= (b & (c >> 4)) ^ ((a ^ b) & (d >> 4))
+
+    a, b, c, d = A, B, C, D
+    C ^= (a & (c >> 8)) ^ (b & (d >> 8))
+    D ^= (b & (c >> 8)) ^ ((a ^ b) & (d >> 8))
+
+    a = C ^ (C >> 1)
+    b = D ^ (D >> 1)
+
+    i0 = x ^ y
+    i1 = b | (0xFFFF ^ (i0 | a))
+
+    i0 = (i0 | (i0 << 8)) & 0x00FF00FF
+    i0 = (i0 | (i0 << 4)) & 0x0F0F0F0F
+    i0 = (i0 | (i0 << 2)) & 0x33333333
+    i0 = (i0 | (i0 << 1)) & 0x55555555
+
+    i1 = (i1 | (i1 << 8)) & 0x00FF00FF
+    i1 = (i1 | (i1 << 4)) & 0x0F0F0F0F
+    i1 = (i1 | (i1 << 2)) & 0x33333333
+    i1 = (i1 | (i1 << 1)) & 0x55555555
+
+    return (i1 << 1) | i0
+
+
+def level_bounds(count):
+    """Get the (start, end) node indices of every level of a packed R-tree, from the leaves up.
+
+    The root is stored first, so the leaves are the last count nodes.
+    """
+    level_sizes = [count]
+    n = count
+    while True:
+        n = math.ceil(n / DEFAULT_NODE_SIZE)
+        level_sizes.append(n)
+        if n == 1:
+            break
+
+    bounds = []
+    end = sum(level_sizes)
+    for size in level_sizes:
+        bounds.append((end - size, end))
+        end -= size
+    return bounds
+
+
+def packed_rtree(leaves):
+    """Encode a packed R-tree over (min_x, min_y, max_x, max_y, offset) leaves in their given order.
+
+    The offset of a leaf is the offset of its feature in the feature data, the
+    offset of any other node is the index of its first child.
+    """
+    levels = level_bounds(len(leaves))
+    nodes = [None] * levels[0][1]
+    nodes[levels[0][0]:] = leaves
+
+    for (child_start, child_end), (parent_start, _) in zip(levels, levels[1:]):
+        parent = parent_start
+        for first_child in range(child_start, child_end, DEFAULT_NODE_SIZE):
+            children = nodes[first_child:min(first_child + DEFAULT_NODE_SIZE, child_end)]
+            nodes[parent] = (
+                min(node[0] for node in children),
+                min(node[1] for node in children),
+                max(node[2] for node in children),
+                max(node[3] for node in children),
+                first_child,
+            )
+            parent += 1
+
+    return b"".join(struct.pack("<ddddQ", *node) for node in nodes)
+
+
+def write_flatgeobuf(output_path, columns, features):
+    """Write (lon, lat, encoded feature) tuples to a FlatGeobuf file in Hilbert order with an index."""
+    envelope = None
+    if features:
+        envelope = [
+            min(feature[0] for feature in features),
+            min(feature[1] for feature in features),
+            max(feature[0] for feature in features),
+            max(feature[1] for feature in features),
+        ]
+        width = envelope[2] - envelope[0]
+        height = envelope[3] - envelope[1]
+
+        def hilbert_key(feature):
+            x = math.floor(HILBERT_MAX * (feature[0] - envelope[0]) / width) if width else 0
+            y = math.floor(HILBERT_MAX * (feature[1] - envelope[1]) / height) if height else 0
+            return hilbert(x, y)
+        features.sort(key=hilbert_key)
+
+    with open(output_path, 'wb') as f:
+        f.write(FLATGEOBUF_MAGIC)
+        f.write(flatgeobuf_header(columns, len(features), envelope))
+        if not features:
+            return
+
+        leaves = []
+        offset = 0
+        for lon, lat, data in features:
+            leaves.append((lon, lat, lon, lat, offset))
+            offset += len(data)
+        f.write(packed_rtree(leaves))
+        for _, _, data in features:
+            f.write(data)
+
+
+def export_batch(vault_path, filepaths, options):
+    """Read a batch of notes and encode their markers as (lon, lat, feature) tuples."""
+    features = []
+    for filepath in filepaths:
+        try:
+            properties = read_frontmatter(filepath)
+        except OSError:
+            continue
+        coordinates = coordinate_from_value(properties.get(options["coordinates"]))
+        if coordinates is None:
+            continue
+
+        lat, lon = coordinates
+        path = Path(filepath)
+        values = [path.relative_to(vault_path).as_posix(), path.stem]
+        for name in [options["icon"], options["color"], *options["properties"]]:
+            value = properties.get(name)
+            values.append(value_to_string(value).strip() or None if value_is_truthy(value) else None)
+
+        if options["format"] == "flatgeobuf":
+            features.append((lon, lat, flatgeobuf_feature(lon, lat, values)))
+        else:
+            feature = {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": dict(zip(options["columns"], values)),
+            }
+            features.append((lon, lat, json.dumps(feature, ensure_ascii=False)))
+    return features
+
+
+def read_features(vault_path, options, workers):
+    """Read the markers of all notes in batches, in a process pool unless one worker is used."""
+    filepaths = list(find_notes(vault_path))
+    batches = [filepaths[start:start + BATCH_SIZE] for start in range(0, len(filepaths), BATCH_SIZE)]
+    if workers == 1:
+        for batch in batches:
+            yield export_batch(vault_path, batch, options)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(export_batch, [vault_path] * len(batches), batches,
+                                    [options] * len(batches))
+
+
+def export_places(vault_path, output_path, output_format=None, coordinates="coordinates", icon="icon",
+                  color="color", properties=None, workers=None):
+    """Export the markers of a vault and return the number of exported features."""
+    output_path = Path(output_path)
+    if output_format is None:
+        output_format = OUTPUT_EXTENSIONS.get(output_path.suffix.lower())
+        if output_format is None:
+            raise ValueError(f"Cannot tell the format of {output_path}, use --format")
+
+    properties = properties or []
+    options = {
+        "format": output_format,
+        "coordinates": coordinates,
+        "icon": icon,
+        "color": color,
+        "properties": properties,
+        "columns": ["path", "name", "icon", "color", *properties],
+    }
+    print(f"Exporting {vault_path} to {output_path}...")
+
+    count = 0
+    batches = read_features(Path(vault_path), options, workers)
+    if output_format == "flatgeobuf":
+        features = [feature for batch in batches for feature in batch]
+        count = len(features)
+        write_flatgeobuf(output_path, options["columns"], features)
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            if output_format == "geojson":
+                f.write('{"type": "FeatureCollection", "features": [\n')
+            for batch in batches:
+                for _, _, feature in batch:
+                    if output_format == "geojson" and count:
+                        f.write(",\n")
+                    f.write(feature)
+                    if output_format == "geojsonseq":
+                        f.write("\n")
+                    count += 1
+            if output_format == "geojson":
+                f.write("\n]}\n")
+
+    print(f"✓ Exported {count} markers to {output_path}")
+    return count
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Export the markers of a vault to GeoJSON or FlatGeobuf.")
+    parser.add_argument("vault", help="Folder to export")
+    parser.add_argument("output", help="File to write")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=None,
+                        help="Output format (default: from the output extension)")
+    parser.add_argument("--coordinates", default="coordinates", help="Coordinates property (default: coordinates)")
+    parser.add_argument("--icon", default="icon", help="Marker icon property (default: icon)")
+    parser.add_argument("--color", default="color", help="Marker color property (default: color)")
+    parser.add_argument("--property", action="append", default=[],
+                        help="Also export this property as a string. Can be repeated")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (default: number of CPUs)")
+    args = parser.parse_args()
+
+    if not Path(args.vault).is_dir():
+        parser.error(f"Folder not found: {args.vault}")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be a positive integer")
+    reserved = {"path", "name", args.icon, args.color}
+    if any(name in reserved for name in args.property):
+        parser.error(f"--property cannot repeat one of: {', '.join(sorted(reserved))}")
+
+    try:
+        export_places(args.vault, args.output, args.format, args.coordinates, args.icon, args.color,
+                      args.property, args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,125 @@
 Generate test markdown files with valid coordinates for Obsidian Maps plugin testing.
 
 Usage:
-    python generate_test_files.py [count]
+    python generate_test_files.py [count] [options]
+    python generate_test_files.py --mutate [options]
 
 Arguments:
     count: Number of files to generate (default: 100)
+
+Options:
+    --seed N: Seed for the random generators. Runs with the same seed and
+        options produce identical files (default: random)
+    --workers N: Number of worker processes used to write files (default: 1)
+    --layout LAYOUT: Folder layout of the generated notes (default: flat)
+        flat:   all notes in a single folder
+        hash:   notes in nested folders named after a hash of the note name
+        region: notes in one folder per world region, e.g. "Western Europe/"
+    --depth N: Number of hashed subfolder levels. Used below the output folder
+        for the hash layout (default: 2) and below the region folder for the
+        region layout (default: 0)
+    --backend BACKEND: How coordinates and types are drawn (default: auto)
+        numpy:  vectorized over a whole chunk, requires NumPy
+        python: one note at a time with the random module
+        auto:   python when --seed is given, otherwise numpy if it is installed
+        The backends draw different values for the same seed, so a seed only
+        picks numpy when asked to. The backend used is written to the manifest.
+    --distribution DISTRIBUTION: How coordinates are spread (default: uniform)
+        uniform:  uniformly inside the world regions
+        hotspots: Gaussian clusters around a set of city centres
+        dateline: Gaussian clusters close to both sides of the antimeridian,
+                  so that the markers span the date line
+    --hotspots N: Number of city centres for the hotspots and dateline
+        distributions (default: 50)
+    --sigma DEGREES: Standard deviation of the clusters in degrees (default: 0.05)
+    --zipf S: Zipf exponent of the city sizes, the k-th city gets 1/k^S as many
+        notes as the largest one. 0 makes all cities equally large (default: 1.0)
+    --duplicates FRACTION: Fraction of hotspot notes placed exactly on their
+        city centre, so that many notes share the same point (default: 0)
+    --formats SPEC: Weighted mix of coordinate formats, e.g.
+        "quoted=80,numeric=10,string=5,malformed=5" (default: quoted=1)
+        quoted:       list of two quoted strings, ["48.85", "2.29"]
+        numeric:      list of two numbers, [48.85, 2.29]
+        string:       single string, "48.85, 2.29"
+        compact:      single string without space, "48.85,2.29"
+        extra:        list with an additional altitude element
+        zero:         latitude or longitude of 0, which the plugin ignores
+        out-of-range: latitude or longitude outside the valid range
+        malformed:    values that are not numbers
+        The last three are invalid and do not show up on the map.
+    --icons N: Number of distinct values of an "icon" property. 0 leaves the
+        property out. Values beyond the built-in list of Lucide icon names are
+        not valid icons, but still count as distinct markers (default: 0)
+    --colors N: Number of distinct values of a "color" property. 0 leaves the
+        property out (default: 0)
+    --style-zipf S: Zipf exponent of the icon and color frequencies. 0 uses
+        every value equally often (default: 0)
+    --properties N: Number of additional properties per note, to make notes
+        as wide as real ones. The properties cycle through text, number,
+        checkbox, date, datetime, list, links, link and description values
+        and are named after their kind, e.g. text1, number1, ..., text2 (default: 0)
+    --list-length N: Maximum number of items of list and links properties (default: 5)
+    --text-size N: Number of characters of description properties (default: 200)
+    --body-size N: Number of characters of text, with wikilinks, written below
+        the frontmatter of every note (default: 0)
+    --bases: Also write .base files with map views that cover the view
+        options: marker properties, fixed and formula centers, zoom limits,
+        custom tiles, embedded height and filters of different selectivity.
+        With --properties, a view shows up to 19 of them in the popup
+    --tile-url URL: Tile URL template used by the custom tile views of the
+        .base files (default: OpenStreetMap)
+    --append: Grow an existing vault to count notes instead of starting from
+        scratch. Existing file names are indexed once and only the missing
+        notes are written. With the same seed and options as the original
+        run, the result is identical to generating count notes at once
+    --archive FORMAT: Write the notes into a single tar, tar.gz or zip archive
+        named after the output folder instead of individual files
+    --compression LEVEL: Compression level for tar.gz (1-9) and zip (0-9)
+        archives. Uses the library default when not set
+
+Mutation mode:
+    --mutate: Keep modifying an existing generated vault instead of generating
+        one, to simulate concurrent edits and sync storms. Stop with Ctrl+C.
+        The manifest of the vault is not updated.
+    --rate N: Average number of mutations per second (default: 10)
+    --burst N: Number of mutations applied at once. Bursts are spaced so that
+        the average rate is kept, e.g. --rate 10 --burst 500 rewrites 500 notes
+        every 50 seconds (default: 1)
+    --duration SECONDS: Stop after this many seconds (default: run until interrupted)
+    --mix SPEC: Weighted mix of mutations (default: move=60,type=20,create=10,delete=10)
+        move:   replace the coordinates of a note
+        type:   replace the type of a note
+        create: create a new note
+        delete: delete a note
+
+A manifest named "<output folder>.manifest.json" is written next to the output
+folder. It records the seed and options of the run, the path, coordinates, type,
+region, icon and color of every note, and the bounds of all coordinates.
 """
 
+import argparse
+import colorsys
+import hashlib
+import io
+import itertools
+import json
 import os
-import sys
 import random
+import re
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Lists for generating random place names
 ADJECTIVES = [
     "Ancient", "Beautiful", "Charming", "Historic", "Grand", "Royal", "Sacred",
@@ -97,114 +205,1012 @@ WORLD_REGIONS = [
     {"name": "Australia East", "lat": (-44.0, -10.0), "lon": (140.0, 154.0)},
     {"name": "Australia West", "lat": (-35.0, -13.0), "lon": (113.0, 130.0)},
     {"name": "New Zealand", "lat": (-47.0, -34.0), "lon": (166.0, 179.0)},
+    # Regions whose western longitude is larger than their eastern one cross the antimeridian
     {"name": "Pacific Islands", "lat": (-25.0, 15.0), "lon": (140.0, -140.0)},
 ]
 
+# Notes are generated in fixed-size chunks, each with its own random generator,
+# so the output does not depend on how chunks are distributed across workers.
+CHUNK_SIZE = 1000
+
+LAYOUTS = ["flat", "hash", "region"]
+
+ARCHIVE_FORMATS = ["tar", "tar.gz", "zip"]
+
+BACKENDS = ["auto", "numpy", "python"]
+
+DISTRIBUTIONS = ["uniform", "hotspots", "dateline"]
+
+# Kinds of the additional properties of wide notes, in the order they are cycled through
+WIDE_PROPERTY_KINDS = ["text", "number", "checkbox", "date", "datetime", "list", "links", "link", "description"]
+
+# The popup renders at most this many properties
+POPUP_PROPERTIES = 20
+
+# Words of generated descriptions and note bodies
+TEXT_WORDS = sorted({word.lower() for phrase in ADJECTIVES + PLACE_TYPES for word in phrase.split()})
+
+# Latitude range of the dateline clusters, from the Chatham Islands to the Aleutians
+DATELINE_LATITUDES = (-45.0, 52.0)
+
+COORDINATE_FORMATS = ["quoted", "numeric", "string", "compact", "extra", "zero", "out-of-range", "malformed"]
+
+# Formats whose coordinates are rejected by coordinateFromValue()
+INVALID_COORDINATE_FORMATS = {"zero", "out-of-range", "malformed"}
+
+# Lucide icon names for the icon property
+ICONS = [
+    "map-pin", "map", "star", "heart", "home", "building", "building-2", "landmark",
+    "church", "castle", "tent", "trees", "tree-pine", "mountain", "mountain-snow", "waves",
+    "anchor", "ship", "sailboat", "plane", "train-front", "tram-front", "bus", "car",
+    "bike", "rocket", "coffee", "utensils", "wine", "beer", "pizza", "sandwich",
+    "soup", "salad", "cookie", "croissant", "cake", "candy", "apple", "cherry",
+    "grape", "carrot", "egg", "shopping-cart", "shopping-bag", "store", "hotel", "bed",
+    "bath", "sofa", "lamp", "hospital", "pill", "stethoscope", "school", "graduation-cap",
+    "library", "book", "book-open", "music", "theater", "film", "camera", "image",
+    "palette", "brush", "flag", "bookmark", "bell", "gift", "trophy", "medal",
+    "award", "crown", "gem", "sun", "moon", "cloud", "umbrella", "snowflake",
+    "flame", "leaf", "flower", "sprout", "fish", "bird", "dog", "cat",
+    "compass", "globe", "navigation", "signpost", "footprints", "fuel", "warehouse", "factory",
+    "ferris-wheel", "dumbbell", "briefcase", "phone", "mail", "key", "lock", "eye",
+    "zap", "battery", "wifi", "shield", "target", "clock", "calendar", "user",
+    "users", "smile", "lightbulb", "wrench", "hammer", "scissors", "glasses", "shirt",
+    "telescope", "microscope", "flask-conical", "atom", "cpu", "monitor", "laptop", "puzzle",
+]
+
+DEFAULT_TILE_URL = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+
+# Views of the generated .base files, using the options of MapView.getViewOptions()
+BASE_VIEWS = """  - type: map
+    name: Markers
+    coordinates: note.coordinates
+  - type: map
+    name: Styled markers
+    coordinates: note.coordinates
+    markerIcon: note.icon
+    markerColor: note.color
+  - type: map
+    name: Fixed center
+    coordinates: note.coordinates
+    markerIcon: note.icon
+    markerColor: note.color
+    center: "[48.8566, 2.3522]"
+    defaultZoom: 6
+    minZoom: 2
+    maxZoom: 12
+  - type: map
+    name: Formula center
+    coordinates: note.coordinates
+    center: this.coordinates
+    defaultZoom: 10
+  - type: map
+    name: Custom tiles
+    coordinates: note.coordinates
+    markerIcon: note.icon
+    markerColor: note.color
+    mapTiles:
+      - {tile_url}
+    mapTilesDark:
+      - {tile_url}
+  - type: map
+    name: Layered tiles
+    coordinates: note.coordinates
+    mapTiles:
+      - {tile_url}
+      - {tile_url}
+  - type: map
+    name: Embedded
+    coordinates: note.coordinates
+    mapHeight: 600
+    defaultZoom: 3
+    minZoom: 1
+    maxZoom: 8
+"""
+
+# Filters of the generated .base files, from every note down to about 2% of them
+BASE_FILTERS = {
+    "Generated places": ['list(category).contains(link("Places"))'],
+    "Generated places - five types": [
+        'list(category).contains(link("Places"))',
+        'list(type).containsAny(link("Church"), link("Museum"), link("Park"), link("Cafe"), link("Hotel"))',
+    ],
+    "Generated places - one type": [
+        'list(category).contains(link("Places"))',
+        'list(type).contains(link("Museum"))',
+    ],
+}
 
-def generate_random_place_name():
-    """Generate a random place name."""
-    pattern = random.choice([
-        lambda: f"{random.choice(ADJECTIVES)} {random.choice(PLACE_TYPES)}",
-        lambda: f"{random.choice(PLACE_NAMES)} {random.choice(PLACE_TYPES)}",
-        lambda: f"{random.choice(PLACE_NAMES)}'s {random.choice(PLACE_TYPES)}",
-        lambda: f"The {random.choice(ADJECTIVES)} {random.choice(PLACE_TYPES)}",
-        lambda: f"{random.choice(PLACE_TYPES)} of {random.choice(PLACE_NAMES)}",
-    ])
-    return pattern()
+MUTATIONS = ["move", "type", "create", "delete"]
 
+COORDINATES_PATTERN = re.compile(r'^coordinates:.*\n(?:  - .*\n)*', re.MULTILINE)
+TYPE_PATTERN = re.compile(r'^type: .*$', re.MULTILINE)
 
-def generate_coordinates():
+MALFORMED_COORDINATES = ["", "abc", "N/A", "null", "--", "north", "[object Object]"]
+
+# Place name patterns: (format, first word list, second word list)
+NAME_PATTERNS = [
+    ("{} {}", ADJECTIVES, PLACE_TYPES),
+    ("{} {}", PLACE_NAMES, PLACE_TYPES),
+    ("{}'s {}", PLACE_NAMES, PLACE_TYPES),
+    ("The {} {}", ADJECTIVES, PLACE_TYPES),
+    ("{} of {}", PLACE_TYPES, PLACE_NAMES),
+]
+
+# Number of distinct place names before numeric suffixes are needed
+NAME_SPACE_SIZE = sum(len(first) * len(second) for _, first, second in NAME_PATTERNS)
+
+
+def place_name_from_index(index):
+    """Get the place name at an index of the combinatorial name space."""
+    for pattern, first, second in NAME_PATTERNS:
+        size = len(first) * len(second)
+        if index < size:
+            return pattern.format(first[index // len(second)], second[index % len(second)])
+        index -= size
+    raise IndexError("Place name index out of range")
+
+
+@lru_cache(maxsize=None)
+def name_permutation(seed):
+    """Get the random order in which the name space is allocated for a seed."""
+    permutation = list(range(NAME_SPACE_SIZE))
+    random.Random(f"{seed}:names").shuffle(permutation)
+    return permutation
+
+
+def allocate_place_names(seed, start, stop):
+    """Allocate the unique place names with allocation indices in [start, stop).
+    
+    Names are drawn from the name space without replacement. Once every name
+    has been used, the sequence starts over with a numeric suffix, e.g.
+    "Grand Museum 2", which cannot collide since base names contain no digits.
+    """
+    permutation = name_permutation(seed)
+    names = []
+    for index in range(start, stop):
+        cycle, offset = divmod(index, NAME_SPACE_SIZE)
+        place_name = place_name_from_index(permutation[offset])
+        names.append(f"{place_name} {cycle + 1}" if cycle > 0 else place_name)
+    return names
+
+
+def region_lon_span(region):
+    """Get the (west, east) longitudes of a region, with east beyond 180 if it crosses the antimeridian."""
+    west, east = region["lon"]
+    return west, east + 360.0 if west > east else east
+
+
+def wrap_longitude(lon):
+    """Wrap a longitude from region_lon_span() back into [-180, 180)."""
+    return lon - 360.0 if lon >= 180.0 else lon
+
+
+def generate_coordinates(rng=random, region=None):
     """Generate random coordinates within a geographic region."""
-    region = random.choice(WORLD_REGIONS)
+    if region is None:
+        region = rng.choice(WORLD_REGIONS)
     
-    lat = random.uniform(region["lat"][0], region["lat"][1])
-    lon = random.uniform(region["lon"][0], region["lon"][1])
+    lat = rng.uniform(region["lat"][0], region["lat"][1])
+    lon = wrap_longitude(rng.uniform(*region_lon_span(region)))
     
     # Format with high precision like the example
     return f"{lat:.14f}", f"{lon:.7f}"
 
 
-def generate_place_type():
+def generate_place_type(rng=random):
     """Generate a random place type in [[Type]] format."""
-    return f"[[{random.choice(PLACE_LINK_TYPES)}]]"
+    return f"[[{rng.choice(PLACE_LINK_TYPES)}]]"
 
 
-def create_markdown_file(directory, filename, coordinates, place_type):
-    """Create a markdown file with YAML frontmatter."""
+@lru_cache(maxsize=None)
+def hotspot_centres(seed, count, distribution="hotspots"):
+    """Get the (region index, lat, lon) city centres used by the hotspots and dateline distributions.
+    
+    Dateline centres alternate between the east and the west side of the
+    antimeridian and lie within one degree of it.
+    """
+    if distribution == "dateline":
+        rng = random.Random(f"{seed}:dateline")
+        region_index = next(i for i, region in enumerate(WORLD_REGIONS) if region["name"] == "Pacific Islands")
+        centres = []
+        for i in range(count):
+            side = 1.0 if i % 2 == 0 else -1.0
+            centres.append((region_index, rng.uniform(*DATELINE_LATITUDES), side * (180.0 - rng.uniform(0.01, 1.0))))
+        return centres
+    
+    rng = random.Random(f"{seed}:hotspots")
+    centres = []
+    for _ in range(count):
+        region_index = rng.randrange(len(WORLD_REGIONS))
+        lat, lon = generate_coordinates(rng, WORLD_REGIONS[region_index])
+        centres.append((region_index, float(lat), float(lon)))
+    return centres
+
+
+def hotspot_weights(count, zipf):
+    """Get the relative city sizes, following Zipf's law with exponent zipf."""
+    return [1 / rank ** zipf for rank in range(1, count + 1)]
+
+
+def clamp_coordinates(lat, lon):
+    """Clamp a latitude to [-90, 90] and wrap a longitude to [-180, 180)."""
+    return min(max(lat, -90.0), 90.0), (lon + 180.0) % 360.0 - 180.0
+
+
+def generate_chunk_attributes(seed, chunk_index, count, options):
+    """Generate the regions, coordinates and types for a chunk of notes.
+    
+    Returns four lists: region indices, formatted latitudes, formatted
+    longitudes and place types in [[Type]] format.
+    """
+    hotspots = options["distribution"] in ("hotspots", "dateline")
+    if hotspots:
+        centres = hotspot_centres(seed, options["hotspots"], options["distribution"])
+        weights = hotspot_weights(len(centres), options["zipf"])
+        sigma = options["sigma"]
+        duplicates = options["duplicates"]
+    
+    if options["backend"] == "numpy":
+        rng = np.random.default_rng([seed, chunk_index])
+        if hotspots:
+            centre_array = np.array(centres)
+            probabilities = np.array(weights) / sum(weights)
+            picks = rng.choice(len(centres), size=count, p=probabilities)
+            region_indices = centre_array[picks, 0].astype(int)
+            
+            # Notes chosen as duplicates stay exactly on their city centre
+            spread = (rng.random(count) >= duplicates) * sigma
+            lats = np.clip(centre_array[picks, 1] + rng.normal(size=count) * spread, -90.0, 90.0)
+            lons = (centre_array[picks, 2] + rng.normal(size=count) * spread + 180.0) % 360.0 - 180.0
+        else:
+            bounds = np.array([region["lat"] + region_lon_span(region) for region in WORLD_REGIONS])
+            region_indices = rng.integers(len(WORLD_REGIONS), size=count)
+            region_bounds = bounds[region_indices]
+            lats = region_bounds[:, 0] + (region_bounds[:, 1] - region_bounds[:, 0]) * rng.random(count)
+            lons = region_bounds[:, 2] + (region_bounds[:, 3] - region_bounds[:, 2]) * rng.random(count)
+            lons = np.where(lons >= 180.0, lons - 360.0, lons)
+        type_indices = rng.integers(len(PLACE_LINK_TYPES), size=count)
+        
+        # Format with high precision like the example
+        link_types = [f"[[{link_type}]]" for link_type in PLACE_LINK_TYPES]
+        return (
+            region_indices.tolist(),
+            [f"{lat:.14f}" for lat in lats.tolist()],
+            [f"{lon:.7f}" for lon in lons.tolist()],
+            [link_types[i] for i in type_indices.tolist()],
+        )
+    
+    rng = random.Random(f"{seed}:{chunk_index}")
+    if hotspots:
+        cumulative_weights = list(itertools.accumulate(weights))
+    region_indices, lats, lons, place_types = [], [], [], []
+    for _ in range(count):
+        if hotspots:
+            region_index, lat, lon = rng.choices(centres, cum_weights=cumulative_weights)[0]
+            if rng.random() >= duplicates:
+                lat, lon = clamp_coordinates(rng.gauss(lat, sigma), rng.gauss(lon, sigma))
+            lat, lon = f"{lat:.14f}", f"{lon:.7f}"
+        else:
+            region_index = rng.randrange(len(WORLD_REGIONS))
+            lat, lon = generate_coordinates(rng, WORLD_REGIONS[region_index])
+        region_indices.append(region_index)
+        lats.append(lat)
+        lons.append(lon)
+        place_types.append(generate_place_type(rng))
+    return region_indices, lats, lons, place_types
+
+
+def apply_coordinate_formats(seed, chunk_index, lats, lons, formats):
+    """Pick a coordinate format for every note of a chunk.
+    
+    The formats are weighted by the formats dict. Coordinates of invalid
+    formats are replaced in place by zero, out-of-range or malformed values.
+    Returns the list of formats.
+    """
+    if list(formats) == ["quoted"]:
+        return ["quoted"] * len(lats)
+    
+    rng = random.Random(f"{seed}:{chunk_index}:formats")
+    picked = rng.choices(list(formats), weights=list(formats.values()), k=len(lats))
+    for i, coordinate_format in enumerate(picked):
+        if coordinate_format == "zero":
+            if rng.random() < 0.5:
+                lats[i] = rng.choice(["0", "0.0"])
+            else:
+                lons[i] = rng.choice(["0", "0.0"])
+        elif coordinate_format == "out-of-range":
+            if rng.random() < 0.5:
+                lats[i] = f"{rng.choice([-1, 1]) * rng.uniform(90.5, 180.0):.14f}"
+            else:
+                lons[i] = f"{rng.choice([-1, 1]) * rng.uniform(180.5, 360.0):.7f}"
+        elif coordinate_format == "malformed":
+            if rng.random() < 0.5:
+                lats[i] = rng.choice(MALFORMED_COORDINATES)
+            else:
+                lons[i] = rng.choice(MALFORMED_COORDINATES)
+    return picked
+
+
+def format_coordinates(coordinates, coordinate_format="quoted"):
+    """Format the coordinates property as YAML in the given format."""
+    lat, lon = coordinates
+    if coordinate_format == "numeric":
+        return f"coordinates:\n  - {lat}\n  - {lon}\n"
+    if coordinate_format == "string":
+        return f'coordinates: "{lat}, {lon}"\n'
+    if coordinate_format == "compact":
+        return f'coordinates: "{lat},{lon}"\n'
+    if coordinate_format == "extra":
+        return f'coordinates:\n  - "{lat}"\n  - "{lon}"\n  - "35"\n'
+    return f'coordinates:\n  - "{lat}"\n  - "{lon}"\n'
+
+
+def style_values(kind, count):
+    """Get count distinct values for the icon or color property."""
+    if kind == "icon":
+        return [ICONS[i] if i < len(ICONS) else f"{ICONS[i % len(ICONS)]}-{i // len(ICONS)}" for i in range(count)]
+    
+    # Spread colors around the hue wheel with the golden ratio so that they stay distinct
+    colors = []
+    for i in range(count):
+        lightness = 0.35 + 0.3 * ((i // 12) % 2)
+        red, green, blue = colorsys.hls_to_rgb((i * 0.618033988749895) % 1.0, lightness, 0.75)
+        colors.append(f"#{round(red * 255):02x}{round(green * 255):02x}{round(blue * 255):02x}")
+    return colors
+
+
+def generate_chunk_styles(seed, chunk_index, count, options):
+    """Pick the icon and color of every note of a chunk. Returns two lists, with None for unset properties."""
+    rng = random.Random(f"{seed}:{chunk_index}:styles")
+    styles = []
+    for kind in ["icon", "color"]:
+        values = style_values(kind, options[f"{kind}s"])
+        if values:
+            weights = hotspot_weights(len(values), options["style_zipf"])
+            styles.append(rng.choices(values, weights=weights, k=count))
+        else:
+            styles.append([None] * count)
+    return styles
+
+
+def wide_property_names(count):
+    """Get the names of the first count additional properties of wide notes."""
+    kinds = len(WIDE_PROPERTY_KINDS)
+    return [f"{WIDE_PROPERTY_KINDS[i % kinds]}{i // kinds + 1}" for i in range(count)]
+
+
+def filler_text(rng, size, links=0.0):
+    """Generate up to size characters of words, a fraction links of them wikilinks to place types."""
+    words = []
+    length = 0
+    while length < size:
+        # Draw roughly the words still needed at once, words average about seven characters
+        for word in rng.choices(TEXT_WORDS, k=(size - length) // 7 + 1):
+            if links and rng.random() < links:
+                word = f"[[{rng.choice(PLACE_LINK_TYPES)}]]"
+            words.append(word)
+            length += len(word) + 1
+    text = " ".join(words)
+    # Cut at a space so that no wikilink is left open
+    return text if len(text) <= size else text[:text.rfind(" ", 0, size + 1)].rstrip()
+
+
+def generate_wide_note(seed, note_index, options):
+    """Generate the additional properties and the body of a wide note.
+    
+    Every note draws from its own random generator, so that its values do not
+    depend on how the notes are split into chunks. Returns a dict of
+    properties and the body, which are empty unless enabled in options.
+    """
+    if not options["properties"] and not options["body_size"]:
+        return {}, None
+    
+    rng = random.Random(f"{seed}:{note_index}:wide")
+    properties = {}
+    for i, name in enumerate(wide_property_names(options["properties"])):
+        kind = WIDE_PROPERTY_KINDS[i % len(WIDE_PROPERTY_KINDS)]
+        if kind == "text":
+            value = f"{rng.choice(ADJECTIVES)} {rng.choice(PLACE_TYPES)}"
+        elif kind == "number":
+            value = rng.randrange(10000) if rng.random() < 0.5 else round(rng.uniform(0, 10000), 2)
+        elif kind == "checkbox":
+            value = rng.random() < 0.5
+        elif kind == "date":
+            value = (date(2000, 1, 1) + timedelta(days=rng.randrange(-36500, 11000))).isoformat()
+        elif kind == "datetime":
+            moment = datetime(2000, 1, 1) + timedelta(seconds=rng.randrange(-36500 * 86400, 11000 * 86400))
+            value = moment.isoformat()
+        elif kind == "list":
+            value = rng.sample(TEXT_WORDS, rng.randint(1, options["list_length"]))
+        elif kind == "links":
+            count = rng.randint(1, options["list_length"])
+            value = [f"[[{link_type}]]" for link_type in rng.choices(PLACE_LINK_TYPES, k=count)]
+        elif kind == "link":
+            value = f"[[{rng.choice(PLACE_LINK_TYPES)}]]"
+        else:
+            value = filler_text(rng, options["text_size"])
+        properties[name] = value
+    
+    body = filler_text(rng, options["body_size"], links=0.05) if options["body_size"] else None
+    return properties, body
+
+
+def markdown_content(coordinates, place_type, coordinate_format="quoted", icon=None, color=None,
+                     properties=None, body=None):
+    """Get the content of a markdown file with YAML frontmatter.
+    
+    The type is left out when place_type is None. Values are written in JSON
+    syntax, which YAML accepts, so that quotes in imported values are escaped.
+    Additional properties are written after the marker style, and the body
+    after the frontmatter.
+    """
+    style = ""
+    if icon is not None:
+        style += f'icon: {json.dumps(icon, ensure_ascii=False)}\n'
+    if color is not None:
+        style += f'color: {json.dumps(color, ensure_ascii=False)}\n'
+    for name, value in (properties or {}).items():
+        style += f'{name}: {json.dumps(value, ensure_ascii=False)}\n'
+    
+    type_line = f'type: {json.dumps(place_type, ensure_ascii=False)}\n' if place_type is not None else ""
     content = f"""---
 category: "[[Places]]"
-type: "{place_type}"
-coordinates:
-  - "{coordinates[0]}"
-  - "{coordinates[1]}"
----
+{type_line}{format_coordinates(coordinates, coordinate_format)}{style}---
 """
+    if body:
+        content += f"\n{body}\n"
+    return content
+
+
+def create_markdown_file(directory, filename, coordinates, place_type, coordinate_format="quoted",
+                         icon=None, color=None, properties=None, body=None):
+    """Create a markdown file with YAML frontmatter."""
+    content = markdown_content(coordinates, place_type, coordinate_format, icon, color, properties, body)
     
     filepath = directory / filename
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(content)
 
 
-def generate_test_files(count=100, output_dir="generated_places"):
-    """Generate test markdown files with coordinates."""
-    # Create output directory
+def base_files(tile_url=DEFAULT_TILE_URL, properties=()):
+    """Get the (filename, content) of every generated .base file.
+    
+    When properties are given, a view that shows them in the popup is added.
+    """
+    views = BASE_VIEWS.format(tile_url=tile_url)
+    if properties:
+        views += "  - type: map\n    name: Wide popups\n    order:\n      - file.name\n"
+        views += "".join(f"      - note.{name}\n" for name in properties)
+        views += "    coordinates: note.coordinates\n"
+    
+    files = []
+    for name, filters in BASE_FILTERS.items():
+        content = "filters:\n  and:\n"
+        content += "".join(f"    - {condition}\n" for condition in filters)
+        content += "views:\n" + views
+        files.append((f"{name}.base", content))
+    return files
+
+
+def note_folder(place_name, region, layout="flat", depth=0):
+    """Get the folder a note is written to for the given layout, relative to the output folder."""
+    parts = []
+    if layout == "region":
+        parts.append(region["name"])
+    if depth > 0:
+        # Two hex characters per level gives a fan-out of 256 folders
+        digest = hashlib.md5(place_name.encode("utf-8")).hexdigest()
+        parts.extend(digest[level * 2:level * 2 + 2] for level in range(depth))
+    return "/".join(parts)
+
+
+def write_chunk(output_path, seed, chunk_index, options):
+    """Write the files for one chunk of notes.
+    
+    Returns the manifest entry of every file written. When writing to an
+    archive, nothing is written to disk and the (path, content) of every
+    file is returned as well, so that a single process can add them.
+    """
+    start = chunk_index * CHUNK_SIZE
+    names = allocate_place_names(seed, start, min(start + CHUNK_SIZE, options["count"]))
+    names = [options["renames"].get(start + i, name) for i, name in enumerate(names)]
+    layout = options["layout"]
+    depth = options["depth"]
+    archive = options["archive"] is not None
+    directories = {}
+    notes = []
+    files = []
+    
+    # Generate coordinates and types for the whole chunk at once. A full chunk is
+    # always drawn, so that a vault is a prefix of any larger one with the same seed.
+    region_indices, lats, lons, place_types = generate_chunk_attributes(seed, chunk_index, CHUNK_SIZE, options)
+    formats = apply_coordinate_formats(seed, chunk_index, lats, lons, options["formats"])
+    icons, colors = generate_chunk_styles(seed, chunk_index, CHUNK_SIZE, options)
+    
+    # Skip the notes of the chunk that already exist when appending
+    skip = max(0, options["start"] - start)
+    rows = itertools.islice(
+        zip(itertools.count(start), names, region_indices, lats, lons, place_types, formats, icons, colors),
+        skip, None)
+    for note_index, place_name, region_index, lat, lon, place_type, coordinate_format, icon, color in rows:
+        region = WORLD_REGIONS[region_index]
+        properties, body = generate_wide_note(seed, note_index, options)
+        folder = note_folder(place_name, region, layout, depth)
+        filename = f"{place_name}.md"
+        relative_path = f"{folder}/{filename}" if folder else filename
+        
+        # Create the file
+        if archive:
+            content = markdown_content((lat, lon), place_type, coordinate_format, icon, color, properties, body)
+            files.append((relative_path, content.encode("utf-8")))
+        else:
+            directory = directories.get(folder)
+            if directory is None:
+                directory = directories[folder] = output_path / folder
+                directory.mkdir(parents=True, exist_ok=True)
+            create_markdown_file(directory, filename, (lat, lon), place_type, coordinate_format, icon, color,
+                                 properties, body)
+        
+        # Invalid coordinates are not shown on the map
+        valid = coordinate_format not in INVALID_COORDINATE_FORMATS
+        notes.append({
+            "path": relative_path,
+            "lat": float(lat) if valid else None,
+            "lon": float(lon) if valid else None,
+            "type": place_type,
+            "region": region["name"],
+            "format": coordinate_format,
+            "valid": valid,
+            "icon": icon,
+            "color": color,
+        })
+    
+    return notes, files
+
+
+def run_bounded(function, calls, workers=None):
+    """Call function with each argument tuple of calls and yield the results in order.
+
+    The calls run in a process pool unless one worker is used (default: number
+    of CPUs). At most two calls per worker are queued, so results never pile
+    up in memory when the consumer is slower than the workers.
+    """
+    if workers == 1:
+        for args in calls:
+            yield function(*args)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for args in calls:
+            pending.append(executor.submit(function, *args))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class ArchiveWriter:
+    """Streams files into a tar, tar.gz or zip archive, below a top-level folder."""
+    
+    def __init__(self, path, archive_format, folder, compression=None):
+        self.folder = folder
+        self.mtime = time.time()
+        self.tar = None
+        self.zip = None
+        if archive_format == "zip":
+            if compression == 0:
+                self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_STORED)
+            else:
+                self.zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=compression)
+        elif archive_format == "tar.gz":
+            self.tar = tarfile.open(path, "w:gz", compresslevel=9 if compression is None else compression)
+        else:
+            self.tar = tarfile.open(path, "w")
+    
+    def add(self, relative_path, data):
+        """Add a file with the given content."""
+        name = f"{self.folder}/{relative_path}"
+        if self.zip is not None:
+            self.zip.writestr(zipfile.ZipInfo(name, time.localtime(self.mtime)[:6]), data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = self.mtime
+            self.tar.addfile(info, io.BytesIO(data))
+    
+    def close(self):
+        """Finish writing the archive."""
+        if self.zip is not None:
+            self.zip.close()
+        else:
+            self.tar.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def manifest_path_for(output_path):
+    """Get the path of the manifest written next to the output folder."""
+    return output_path.parent / f"{output_path.name}.manifest.json"
+
+
+def read_manifest_notes(manifest_path):
+    """Iterate over the notes of a manifest without loading all of it."""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        # The header and bounds are on the first and last line, with one note per line in between
+        next(f)
+        for line in f:
+            if line.startswith("]"):
+                break
+            yield json.loads(line.rstrip().rstrip(","))
+
+
+def find_renames(seed, start, stop, existing_names):
+    """Find new names for allocation indices in [start, stop) whose names are already taken.
+    
+    This only happens when appending to a vault that was not generated with
+    the same seed. Replacement names get a "(n)" suffix, which the allocator
+    never produces.
+    """
+    renames = {}
+    for index in range(start, stop, CHUNK_SIZE):
+        names = allocate_place_names(seed, index, min(index + CHUNK_SIZE, stop))
+        for offset, place_name in enumerate(names):
+            if place_name in existing_names:
+                suffix = 2
+                while f"{place_name} ({suffix})" in existing_names:
+                    suffix += 1
+                renames[index + offset] = f"{place_name} ({suffix})"
+                existing_names.add(renames[index + offset])
+    return renames
+
+
+def generate_test_files(count=100, output_dir="generated_places", workers=1, seed=None,
+                        layout="flat", depth=None, backend="auto", distribution="uniform",
+                        hotspots=50, sigma=0.05, zipf=1.0, duplicates=0.0, formats=None,
+                        icons=0, colors=0, style_zipf=0.0, properties=0, list_length=5, text_size=200,
+                        body_size=0, archive=None, compression=None, append=False, bases=False,
+                        tile_url=DEFAULT_TILE_URL):
+    """Generate test markdown files with coordinates.
+    
+    Notes are split into chunks that each own a disjoint range of name
+    allocation indices, so the output for a given seed is the same
+    regardless of the number of workers.
+    
+    When appending, count is the total number of notes and only the notes
+    missing from the existing vault are written.
+    """
+    # Create output directory, unless all files go into an archive
     script_dir = Path(__file__).parent
     output_path = script_dir / output_dir
-    output_path.mkdir(exist_ok=True)
+    if archive is None:
+        output_path.mkdir(exist_ok=True)
     
-    print(f"Generating {count} test files in {output_path}...")
+    # A given seed must give the same vault whether or not NumPy is installed
+    if backend == "auto":
+        backend = "numpy" if np is not None and seed is None else "python"
+    if seed is None:
+        seed = random.randrange(2**32)
+    if depth is None:
+        depth = 2 if layout == "hash" else 0
+    if backend == "numpy" and np is None:
+        raise RuntimeError("The numpy backend requires NumPy to be installed")
+    if formats is None:
+        formats = {"quoted": 1}
+    if append and archive is not None:
+        raise ValueError("Appending is not supported for archives")
     
-    # Keep track of generated names to avoid duplicates
-    generated_names = set()
+    # Index the existing vault once, so that new names never collide with it
+    existing_names = set()
+    if append:
+        for _, _, filenames in os.walk(output_path):
+            existing_names.update(filename[:-3] for filename in filenames if filename.endswith(".md"))
+    start = len(existing_names)
+    if start >= count:
+        print(f"Nothing to do, {output_path} already contains {start} files")
+        return output_path
     
-    for i in range(count):
-        # Generate unique place name
-        attempt = 0
-        while attempt < 100:  # Prevent infinite loop
-            place_name = generate_random_place_name()
-            if place_name not in generated_names:
-                generated_names.add(place_name)
-                break
-            attempt += 1
-        else:
-            # If we can't find a unique name, append a number
-            place_name = f"{generate_random_place_name()} {i}"
+    options = {
+        "count": count, "layout": layout, "depth": depth, "backend": backend,
+        "distribution": distribution, "hotspots": hotspots, "sigma": sigma, "zipf": zipf, "duplicates": duplicates,
+        "formats": formats, "icons": icons, "colors": colors, "style_zipf": style_zipf,
+        "properties": properties, "list_length": list_length, "text_size": text_size, "body_size": body_size,
+        "archive": archive,
+        "start": start,
+    }
+    # Renames are only needed by the chunks and are not recorded in the manifest
+    renames = find_renames(seed, start, count, existing_names)
+    
+    destination = output_path.parent / f"{output_path.name}.{archive}" if archive else output_path
+    print(f"Generating {count - start} test files in {destination} (seed {seed})...")
+    
+    chunks = [
+        (output_path, seed, chunk_index, {**options, "renames": renames})
+        for chunk_index in range(start // CHUNK_SIZE, (count + CHUNK_SIZE - 1) // CHUNK_SIZE)
+    ]
+    
+    # When appending, the notes of the previous manifest are carried over
+    manifest_path = manifest_path_for(output_path)
+    previous_manifest_path = manifest_path.with_name(manifest_path.name + ".previous")
+    previous_notes = []
+    if append and manifest_path.exists():
+        manifest_path.replace(previous_manifest_path)
+        previous_notes = read_manifest_notes(previous_manifest_path)
+    
+    # The manifest is streamed so that it never has to be held in memory
+    bounds = None
+    written = 0
+    writer = ArchiveWriter(destination, archive, output_path.name, compression) if archive else None
+    with open(manifest_path, 'w', encoding='utf-8') as manifest:
+        header = {"seed": seed, **options}
+        manifest.write(json.dumps(header)[:-1] + ', "notes": [\n')
         
-        # Generate coordinates and type
-        coordinates = generate_coordinates()
-        place_type = generate_place_type()
+        def write_notes(notes):
+            nonlocal bounds, written
+            for note in notes:
+                # Invalid coordinates do not count towards the bounds
+                lat, lon = note["lat"], note["lon"]
+                if note["valid"] and bounds is None:
+                    bounds = [lat, lon, lat, lon]
+                elif note["valid"]:
+                    bounds = [min(bounds[0], lat), min(bounds[1], lon), max(bounds[2], lat), max(bounds[3], lon)]
+                
+                separator = ",\n" if written > 0 else ""
+                manifest.write(separator + json.dumps(note, ensure_ascii=False))
+                written += 1
         
-        # Create filename
-        filename = f"{place_name}.md"
+        write_notes(previous_notes)
         
-        # Create the file
-        create_markdown_file(output_path, filename, coordinates, place_type)
+        generated = 0
+        for notes, files in run_bounded(write_chunk, chunks, workers):
+            for relative_path, data in files:
+                writer.add(relative_path, data)
+            write_notes(notes)
+            generated += len(notes)
+            
+            # Print progress for large batches
+            if (start + generated) % 1000 == 0:
+                print(f"  Generated {generated} files...")
         
-        # Print progress for large batches
-        if (i + 1) % 1000 == 0:
-            print(f"  Generated {i + 1} files...")
+        if bounds is not None:
+            bounds = dict(zip(["min_lat", "min_lon", "max_lat", "max_lon"], bounds))
+        manifest.write('\n], "bounds": ' + json.dumps(bounds) + '}\n')
+    
+    previous_manifest_path.unlink(missing_ok=True)
+    
+    if bases:
+        for filename, content in base_files(tile_url, wide_property_names(min(properties, POPUP_PROPERTIES - 1))):
+            if writer is not None:
+                writer.add(filename, content.encode("utf-8"))
+            else:
+                with open(output_path / filename, 'w', encoding='utf-8') as f:
+                    f.write(content)
+    
+    if writer is not None:
+        writer.close()
     
-    print(f"✓ Successfully generated {count} files in {output_path}/")
+    print(f"✓ Successfully generated {generated} files in {destination}" + ("" if archive else "/"))
+    print(f"  Manifest written to {manifest_path}")
     return output_path
 
 
+def mutate_note(filepath, pattern, replacement):
+    """Replace the first match of pattern in a note. Returns False if the note has no match."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except FileNotFoundError:
+        return False
+    
+    content, replaced = pattern.subn(lambda _: replacement, content, count=1)
+    if replaced:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return replaced > 0
+
+
+def mutate_vault(output_dir="generated_places", seed=None, rate=10.0, burst=1, duration=None, mix=None,
+                 layout="flat", depth=None):
+    """Keep applying random mutations to an existing generated vault.
+    
+    Mutations are applied in bursts of burst notes, spaced so that the
+    average is rate mutations per second, until duration seconds have passed.
+    """
+    script_dir = Path(__file__).parent
+    output_path = script_dir / output_dir
+    if not output_path.is_dir():
+        raise FileNotFoundError(f"No vault found at {output_path}")
+    
+    if seed is None:
+        seed = random.randrange(2**32)
+    if depth is None:
+        depth = 2 if layout == "hash" else 0
+    if mix is None:
+        mix = {"move": 60, "type": 20, "create": 10, "delete": 10}
+    rng = random.Random(f"{seed}:mutate")
+    
+    # Index the vault once, then keep the index up to date while mutating
+    paths = sorted(output_path.rglob("*.md"))
+    print(f"Mutating {len(paths)} files in {output_path} (seed {seed})...")
+    
+    interval = burst / rate
+    next_name_index = len(paths)
+    started = time.monotonic()
+    next_burst = started
+    counts = dict.fromkeys(mix, 0)
+    try:
+        while duration is None or next_burst - started < duration:
+            time.sleep(max(0.0, next_burst - time.monotonic()))
+            
+            for mutation in rng.choices(list(mix), weights=list(mix.values()), k=burst):
+                if mutation == "create" or not paths:
+                    region = rng.choice(WORLD_REGIONS)
+                    # Skip over names that already exist, e.g. from a vault generated with another seed
+                    while True:
+                        place_name = allocate_place_names(seed, next_name_index, next_name_index + 1)[0]
+                        next_name_index += 1
+                        directory = output_path / note_folder(place_name, region, layout, depth)
+                        filepath = directory / f"{place_name}.md"
+                        if not filepath.exists():
+                            break
+                    directory.mkdir(parents=True, exist_ok=True)
+                    create_markdown_file(directory, filepath.name, generate_coordinates(rng, region),
+                                         generate_place_type(rng))
+                    paths.append(filepath)
+                    mutation = "create"
+                elif mutation == "delete":
+                    # Swap the deleted path with the last one to remove it in O(1)
+                    index = rng.randrange(len(paths))
+                    paths[index], paths[-1] = paths[-1], paths[index]
+                    paths.pop().unlink(missing_ok=True)
+                elif mutation == "move":
+                    lat, lon = generate_coordinates(rng)
+                    mutate_note(rng.choice(paths), COORDINATES_PATTERN, format_coordinates((lat, lon)))
+                else:
+                    mutate_note(rng.choice(paths), TYPE_PATTERN, f'type: "{generate_place_type(rng)}"')
+                counts[mutation] += 1
+            
+            summary = ", ".join(f"{name} {count}" for name, count in counts.items())
+            print(f"  {time.monotonic() - started:8.1f}s  {len(paths)} files  ({summary})")
+            next_burst += interval
+    except KeyboardInterrupt:
+        pass
+    
+    print(f"✓ Applied {sum(counts.values())} mutations to {output_path}/")
+    return output_path
+
+
+def positive_int(value):
+    """Argument type for strictly positive integers."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid value '{value}'. Must be an integer.")
+    if number < 1:
+        raise argparse.ArgumentTypeError("Value must be a positive integer")
+    return number
+
+
+def weighted_spec(choices, kind):
+    """Create an argument type for weighted specs like "quoted=80,string=20" with the given choices."""
+    def parse(value):
+        weights = {}
+        for item in value.split(","):
+            name, _, weight = item.strip().partition("=")
+            if name not in choices:
+                raise argparse.ArgumentTypeError(f"Unknown {kind} '{name}'. Must be one of: {', '.join(choices)}")
+            try:
+                weights[name] = float(weight) if weight else 1.0
+            except ValueError:
+                raise argparse.ArgumentTypeError(f"Invalid weight '{weight}' for {kind} '{name}'")
+            if weights[name] < 0:
+                raise argparse.ArgumentTypeError(f"Weight of {kind} '{name}' must not be negative")
+        if sum(weights.values()) <= 0:
+            raise argparse.ArgumentTypeError(f"At least one {kind} needs a positive weight")
+        return weights
+    return parse
+
+
 def main():
     """Main entry point."""
-    count = 100  # Default
+    parser = argparse.ArgumentParser(description="Generate test markdown files for the Obsidian Maps plugin.")
+    parser.add_argument("count", nargs="?", type=positive_int, default=100,
+                        help="Number of files to generate (default: 100)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for the random generators (default: random)")
+    parser.add_argument("--workers", type=positive_int, default=1,
+                        help="Number of worker processes used to write files (default: 1)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="flat",
+                        help="Folder layout of the generated notes (default: flat)")
+    parser.add_argument("--depth", type=int, default=None,
+                        help="Number of hashed subfolder levels (default: 2 for hash, 0 for region)")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="How coordinates and types are drawn (default: auto)")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="uniform",
+                        help="How coordinates are spread (default: uniform)")
+    parser.add_argument("--hotspots", type=positive_int, default=50,
+                        help="Number of city centres for the hotspots and dateline distributions (default: 50)")
+    parser.add_argument("--sigma", type=float, default=0.05,
+                        help="Standard deviation of the clusters in degrees (default: 0.05)")
+    parser.add_argument("--zipf", type=float, default=1.0,
+                        help="Zipf exponent of the city sizes (default: 1.0)")
+    parser.add_argument("--duplicates", type=float, default=0.0,
+                        help="Fraction of hotspot notes placed exactly on their city centre (default: 0)")
+    parser.add_argument("--formats", type=weighted_spec(COORDINATE_FORMATS, "coordinate format"), default=None,
+                        help="Weighted mix of coordinate formats, e.g. quoted=80,string=20 (default: quoted=1)")
+    parser.add_argument("--icons", type=int, default=0,
+                        help="Number of distinct values of an icon property, 0 to leave it out (default: 0)")
+    parser.add_argument("--colors", type=int, default=0,
+                        help="Number of distinct values of a color property, 0 to leave it out (default: 0)")
+    parser.add_argument("--style-zipf", type=float, default=0.0,
+                        help="Zipf exponent of the icon and color frequencies (default: 0)")
+    parser.add_argument("--properties", type=int, default=0,
+                        help="Number of additional properties per note (default: 0)")
+    parser.add_argument("--list-length", type=positive_int, default=5,
+                        help="Maximum number of items of list and links properties (default: 5)")
+    parser.add_argument("--text-size", type=int, default=200,
+                        help="Number of characters of description properties (default: 200)")
+    parser.add_argument("--body-size", type=int, default=0,
+                        help="Number of characters of text below the frontmatter of every note (default: 0)")
+    parser.add_argument("--bases", action="store_true",
+                        help="Also write .base files with map views covering the view options")
+    parser.add_argument("--tile-url", default=DEFAULT_TILE_URL,
+                        help="Tile URL template used by the custom tile views of the .base files")
+    parser.add_argument("--append", action="store_true",
+                        help="Grow an existing vault to count notes instead of starting from scratch")
+    parser.add_argument("--archive", choices=ARCHIVE_FORMATS, default=None,
+                        help="Write the notes into a single archive instead of individual files")
+    parser.add_argument("--compression", type=int, default=None,
+                        help="Compression level for tar.gz and zip archives (default: library default)")
+    parser.add_argument("--mutate", action="store_true",
+                        help="Keep modifying an existing generated vault instead of generating one")
+    parser.add_argument("--rate", type=float, default=10.0,
+                        help="Average number of mutations per second (default: 10)")
+    parser.add_argument("--burst", type=positive_int, default=1,
+                        help="Number of mutations applied at once (default: 1)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Stop mutating after this many seconds (default: run until interrupted)")
+    parser.add_argument("--mix", type=weighted_spec(MUTATIONS, "mutation"), default=None,
+                        help="Weighted mix of mutations (default: move=60,type=20,create=10,delete=10)")
+    args = parser.parse_args()
     
-    if len(sys.argv) > 1:
-        try:
-            count = int(sys.argv[1])
-            if count < 1:
-                print("Error: Count must be a positive integer")
-                sys.exit(1)
-        except ValueError:
-            print(f"Error: Invalid count '{sys.argv[1]}'. Must be an integer.")
-            sys.exit(1)
+    if args.depth is not None and args.depth < 0:
+        parser.error("--depth must not be negative")
+    if args.backend == "numpy" and np is None:
+        parser.error("--backend numpy requires NumPy to be installed")
+    if args.sigma < 0 or args.zipf < 0 or args.style_zipf < 0:
+        parser.error("--sigma, --zipf and --style-zipf must not be negative")
+    if args.icons < 0 or args.colors < 0:
+        parser.error("--icons and --colors must not be negative")
+    if args.properties < 0 or args.text_size < 0 or args.body_size < 0:
+        parser.error("--properties, --text-size and --body-size must not be negative")
+    if not 0 <= args.duplicates <= 1:
+        parser.error("--duplicates must be between 0 and 1")
+    if args.append and args.archive is not None:
+        parser.error("--append cannot be combined with --archive")
+    if args.compression is not None and not 0 <= args.compression <= 9:
+        parser.error("--compression must be between 0 and 9")
+    if args.rate <= 0:
+        parser.error("--rate must be positive")
     
-    generate_test_files(count)
+    if args.mutate:
+        mutate_vault(seed=args.seed, rate=args.rate, burst=args.burst, duration=args.duration, mix=args.mix,
+                     layout=args.layout, depth=args.depth)
+        return
+    
+    generate_test_files(args.count, workers=args.workers, seed=args.seed, layout=args.layout, depth=args.depth,
+                        backend=args.backend, distribution=args.distribution, hotspots=args.hotspots,
+                        sigma=args.sigma, zipf=args.zipf, duplicates=args.duplicates, formats=args.formats,
+                        icons=args.icons, colors=args.colors, style_zipf=args.style_zipf,
+                        properties=args.properties, list_length=args.list_length, text_size=args.text_size,
+                        body_size=args.body_size, archive=args.archive, compression=args.compression,
+                        append=args.append, bases=args.bases, tile_url=args.tile_url)
 
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic raster tile pyramid for offline Obsidian Maps plugin testing.
+
+Every tile is a PNG with a color gradient, a grid and its z/x/y label, so
+tiles from different positions and zoom levels are easy to tell apart on the
+map. The tiles can be served with tile_server.py --tiles.
+
+Usage:
+    python generate_tiles.py OUTPUT [options]
+
+Arguments:
+    OUTPUT: MBTiles file (.mbtiles) or folder of a {z}/{x}/{y}.png tree
+
+Options:
+    --min-zoom N: Lowest zoom level (default: 0)
+    --max-zoom N: Highest zoom level (default: 6)
+    --bbox WEST,SOUTH,EAST,NORTH: Area covered by the tiles in degrees. A west
+        longitude larger than the east one crosses the antimeridian
+        (default: -180,-85.0511,180,85.0511)
+    --noise BITS: Number of low bits of every color channel that are
+        randomized. Noise makes tiles compress like real imagery, e.g. 2 gives
+        tiles of about 70 KB instead of 2 KB (default: 0)
+    --seed N: Seed for the noise (default: 0)
+    --workers N: Number of worker processes (default: number of CPUs)
+    --format FORMAT: Output format, mbtiles or tree (default: from OUTPUT)
+
+Tile counts grow by 4 per zoom level, the whole world down to zoom 14 has
+358 million tiles. Use --bbox to limit high zoom levels to a region.
+"""
+
+import argparse
+import colorsys
+import math
+import random
+import sqlite3
+from pathlib import Path
+
+from generate_test_files import run_bounded
+from tile_server import TILE_SIZE, encode_png
+
+OUTPUT_FORMATS = ["mbtiles", "tree"]
+
+# Latitude limit of Web Mercator
+MAX_LATITUDE = 85.0511287798
+WORLD_BBOX = (-180.0, -MAX_LATITUDE, 180.0, MAX_LATITUDE)
+
+# Number of tiles rendered per task, and number of tiles per MBTiles transaction
+BATCH_SIZE = 256
+
+GRID_SPACING = 32
+
+# 3x5 pixel glyphs of the tile labels, one string of 0s and 1s per row
+GLYPHS = {
+    "0": ["111", "101", "101", "101", "111"],
+    "1": ["010", "110", "010", "010", "111"],
+    "2": ["111", "001", "111", "100", "111"],
+    "3": ["111", "001", "111", "001", "111"],
+    "4": ["101", "101", "111", "001", "001"],
+    "5": ["111", "100", "111", "001", "111"],
+    "6": ["111", "100", "111", "101", "111"],
+    "7": ["111", "001", "001", "001", "001"],
+    "8": ["111", "101", "111", "101", "111"],
+    "9": ["111", "101", "111", "001", "111"],
+    "/": ["001", "001", "010", "100", "100"],
+}
+
+
+def lon_to_tile_x(lon, zoom):
+    """Get the column of the tile containing a longitude."""
+    n = 1 << zoom
+    return min(max(int((lon + 180.0) / 360.0 * n), 0), n - 1)
+
+
+def lat_to_tile_y(lat, zoom):
+    """Get the row of the Web Mercator tile containing a latitude."""
+    n = 1 << zoom
+    lat = math.radians(min(max(lat, -MAX_LATITUDE), MAX_LATITUDE))
+    y = (1.0 - math.asinh(math.tan(lat)) / math.pi) / 2.0 * n
+    return min(max(int(y), 0), n - 1)
+
+
+def tile_ranges(bbox, zoom):
+    """Get the (x range, y range) pairs of the tiles covering a bbox, two if it crosses the antimeridian."""
+    west, south, east, north = bbox
+    rows = range(lat_to_tile_y(north, zoom), lat_to_tile_y(south, zoom) + 1)
+    if west > east:
+        return [
+            (range(lon_to_tile_x(west, zoom), 1 << zoom), rows),
+            (range(0, lon_to_tile_x(east, zoom) + 1), rows),
+        ]
+    return [(range(lon_to_tile_x(west, zoom), lon_to_tile_x(east, zoom) + 1), rows)]
+
+
+def count_tiles(bbox, min_zoom, max_zoom):
+    """Count the tiles of a pyramid."""
+    return sum(
+        len(columns) * len(rows)
+        for zoom in range(min_zoom, max_zoom + 1)
+        for columns, rows in tile_ranges(bbox, zoom)
+    )
+
+
+def tile_batches(bbox, min_zoom, max_zoom):
+    """Split the tiles of a pyramid into (zoom, x, y start, y stop) column slices of up to BATCH_SIZE tiles."""
+    for zoom in range(min_zoom, max_zoom + 1):
+        for columns, rows in tile_ranges(bbox, zoom):
+            for x in columns:
+                for y in range(rows.start, rows.stop, BATCH_SIZE):
+                    yield zoom, x, y, min(y + BATCH_SIZE, rows.stop)
+
+
+def color(hue, lightness, saturation=0.6):
+    """Get the RGB bytes of a color given in HLS."""
+    return bytes(round(channel * 255) for channel in colorsys.hls_to_rgb(hue, lightness, saturation))
+
+
+def render_tile(zoom, x, y, noise=0, seed=0):
+    """Render a tile as PNG.
+
+    The hue depends on the column and the zoom level, and the lightness
+    follows the latitude, so that the gradient is continuous across the rows
+    of tiles of a zoom level.
+    """
+    n = 1 << zoom
+    hue = ((x + 0.5) / n * 0.8 + zoom * 0.13) % 1.0
+    grid = color(hue, 0.25)
+    rows = []
+    for row in range(TILE_SIZE):
+        if row % GRID_SPACING == 0 or row == TILE_SIZE - 1:
+            rows.append(bytearray(grid * TILE_SIZE))
+            continue
+        lightness = 0.8 - 0.5 * (y * TILE_SIZE + row) / (n * TILE_SIZE)
+        pixels = bytearray(color(hue, lightness) * TILE_SIZE)
+        for column in range(0, TILE_SIZE, GRID_SPACING):
+            pixels[column * 3:column * 3 + 3] = grid
+        pixels[-3:] = grid
+        rows.append(pixels)
+
+    # Draw the label in black on a white box in the middle of the tile
+    label = f"{zoom}/{x}/{y}"
+    scale = max(1, min(4, (TILE_SIZE - 16) // (len(label) * 4)))
+    width = (len(label) * 4 - 1) * scale
+    left = (TILE_SIZE - width) // 2
+    top = (TILE_SIZE - 5 * scale) // 2
+    for row in range(top - scale, top + 6 * scale):
+        rows[row][(left - scale) * 3:(left + width + scale) * 3] = b"\xff" * ((width + 2 * scale) * 3)
+    for index, char in enumerate(label):
+        char_left = left + index * 4 * scale
+        for glyph_row, bits in enumerate(GLYPHS[char]):
+            for glyph_column, bit in enumerate(bits):
+                if bit == "1":
+                    start = (char_left + glyph_column * scale) * 3
+                    for row in range(top + glyph_row * scale, top + (glyph_row + 1) * scale):
+                        rows[row][start:start + scale * 3] = bytes(scale * 3)
+
+    if noise:
+        # XOR the low bits of every channel with random bits, one big integer per row
+        rng = random.Random(f"{seed}:{zoom}/{x}/{y}")
+        mask = int.from_bytes(bytes([(1 << noise) - 1]) * (TILE_SIZE * 3), "big")
+        rows = [
+            (int.from_bytes(pixels, "big") ^ (rng.getrandbits(TILE_SIZE * 24) & mask)).to_bytes(TILE_SIZE * 3, "big")
+            for pixels in rows
+        ]
+    return encode_png(TILE_SIZE, TILE_SIZE, [bytes(pixels) for pixels in rows])
+
+
+def render_batch(output_path, batch, options):
+    """Render a column slice of tiles.
+
+    In a tree the tiles are written directly and only their sizes are
+    returned. Otherwise (zoom, x, y, png) tuples are returned for the writer.
+    """
+    zoom, x, y_start, y_stop = batch
+    tiles = []
+    directory = output_path / str(zoom) / str(x) if options["format"] == "tree" else None
+    if directory is not None:
+        directory.mkdir(parents=True, exist_ok=True)
+    for y in range(y_start, y_stop):
+        data = render_tile(zoom, x, y, options["noise"], options["seed"])
+        if directory is not None:
+            (directory / f"{y}.png").write_bytes(data)
+            tiles.append((zoom, x, y, len(data)))
+        else:
+            tiles.append((zoom, x, y, data))
+    return tiles
+
+
+def open_mbtiles(output_path, bbox, min_zoom, max_zoom):
+    """Create an MBTiles file with its metadata and return the connection."""
+    output_path.unlink(missing_ok=True)
+    connection = sqlite3.connect(output_path)
+    # The file is rebuilt from scratch when generation fails, so durability is not needed
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+    connection.execute("CREATE TABLE metadata (name TEXT, value TEXT)")
+    connection.execute("CREATE TABLE tiles (zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB)")
+    connection.execute("CREATE UNIQUE INDEX tile_index ON tiles (zoom_level, tile_column, tile_row)")
+
+    west, south, east, north = bbox
+    center_lon = (west + east) / 2 if west <= east else ((west + east + 360) / 2 + 180) % 360 - 180
+    metadata = {
+        "name": output_path.stem,
+        "description": "Synthetic tiles for Obsidian Maps plugin testing",
+        "format": "png",
+        "type": "baselayer",
+        "version": "1",
+        "bounds": f"{west},{south},{east},{north}",
+        "center": f"{center_lon},{(south + north) / 2},{min_zoom}",
+        "minzoom": str(min_zoom),
+        "maxzoom": str(max_zoom),
+    }
+    connection.executemany("INSERT INTO metadata VALUES (?, ?)", metadata.items())
+    connection.commit()
+    return connection
+
+
+def generate_tiles(output, min_zoom=0, max_zoom=6, bbox=WORLD_BBOX, noise=0, seed=0, workers=None,
+                   output_format=None):
+    """Generate a tile pyramid and return the number of tiles written."""
+    output_path = Path(output)
+    if output_format is None:
+        output_format = "mbtiles" if output_path.suffix.lower() == ".mbtiles" else "tree"
+    options = {"format": output_format, "noise": noise, "seed": seed}
+
+    total = count_tiles(bbox, min_zoom, max_zoom)
+    print(f"Generating {total} tiles for zoom {min_zoom}-{max_zoom} in {output_path}...")
+
+    connection = None
+    if output_format == "mbtiles":
+        connection = open_mbtiles(output_path, bbox, min_zoom, max_zoom)
+    else:
+        output_path.mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    size = 0
+    # Only a few batches are queued at once, so rendered tiles never pile up when the writer is slower
+    batches = ((output_path, batch, options) for batch in tile_batches(bbox, min_zoom, max_zoom))
+    for tiles in run_bounded(render_batch, batches, workers):
+        if connection is not None:
+            # MBTiles numbers rows from the south like TMS
+            connection.executemany(
+                "INSERT INTO tiles VALUES (?, ?, ?, ?)",
+                [(zoom, x, (1 << zoom) - 1 - y, data) for zoom, x, y, data in tiles],
+            )
+            connection.commit()
+            size += sum(len(tile[3]) for tile in tiles)
+        else:
+            size += sum(tile[3] for tile in tiles)
+
+        # Print progress for large pyramids
+        previous, written = written, written + len(tiles)
+        if written // 10000 > previous // 10000:
+            print(f"  Generated {written} of {total} tiles...")
+
+    if connection is not None:
+        connection.close()
+
+    average = size / written / 1024 if written else 0
+    print(f"✓ Successfully generated {written} tiles ({average:.1f} KB on average) in {output_path}")
+    return written
+
+
+def parse_bbox(value):
+    """Argument type for WEST,SOUTH,EAST,NORTH bounding boxes."""
+    try:
+        west, south, east, north = (float(part) for part in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid bbox '{value}'. Must be WEST,SOUTH,EAST,NORTH")
+    if not (-180 <= west <= 180 and -180 <= east <= 180 and -90 <= south < north <= 90):
+        raise argparse.ArgumentTypeError(f"Invalid bbox '{value}'. Longitudes must be within [-180, 180] "
+                                         "and latitudes within [-90, 90], with south below north")
+    return west, south, east, north
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic raster tile pyramid.")
+    parser.add_argument("output", help="MBTiles file (.mbtiles) or folder of a {z}/{x}/{y}.png tree")
+    parser.add_argument("--min-zoom", type=int, default=0, help="Lowest zoom level (default: 0)")
+    parser.add_argument("--max-zoom", type=int, default=6, help="Highest zoom level (default: 6)")
+    parser.add_argument("--bbox", type=parse_bbox, default=WORLD_BBOX,
+                        help="Area covered by the tiles as WEST,SOUTH,EAST,NORTH (default: the whole world)")
+    parser.add_argument("--noise", type=int, default=0,
+                        help="Number of randomized low bits of every color channel (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the noise (default: 0)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=None,
+                        help="Output format (default: mbtiles for .mbtiles files, tree otherwise)")
+    args = parser.parse_args()
+
+    if not 0 <= args.min_zoom <= args.max_zoom <= 24:
+        parser.error("Zoom levels must satisfy 0 <= --min-zoom <= --max-zoom <= 24")
+    if not 0 <= args.noise <= 8:
+        parser.error("--noise must be between 0 and 8")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be a positive integer")
+
+    generate_tiles(args.output, args.min_zoom, args.max_zoom, args.bbox, args.noise, args.seed, args.workers,
+                   args.format)
+
+
+if __name__ == "__main__":
+    main()
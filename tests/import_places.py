@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Import places from CSV or GeoJSON into notes for the Obsidian Maps plugin.
+
+The input is streamed in batches, so datasets with millions of rows are
+imported with constant memory. Notes are written with the frontmatter of
+generate_test_files.py, and only rows with coordinates that the plugin shows
+on the map are imported.
+
+Usage:
+    python import_places.py INPUT [options]
+
+Arguments:
+    INPUT: CSV, GeoJSON or newline-delimited GeoJSON file
+
+Options:
+    --output DIR: Folder the notes are written to (default: imported_places)
+    --input-format FORMAT: Format of the input (default: auto)
+        csv:        comma-separated values with a header row, .csv and .tsv
+        geojson:    a FeatureCollection, .geojson and .json
+        geojsonseq: one Feature per line, .geojsonl, .geojsons, .ndjson and .jsonl
+        auto:       chosen from the file extension
+    --delimiter CHAR: Delimiter of CSV files (default: "," and tab for .tsv)
+    --name COLUMN: Column used as note name (default: "name" or "title" if
+        present). Rows without a name are called "Place N" after their row
+    --lat COLUMN, --lon COLUMN: Latitude and longitude columns (default:
+        detected from names like lat/latitude and lon/lng/longitude in CSV
+        files, the Point geometry in GeoJSON files)
+    --coordinates COLUMN: Single column with "lat, lon" strings, instead of
+        --lat and --lon. GeoJSON properties may also hold [lat, lon] lists
+    --type COLUMN: Column written to the type property
+    --icon COLUMN: Column written to the icon property
+    --color COLUMN: Column written to the color property
+    --property NAME=COLUMN: Write a column to a property. Can be repeated
+    --all-properties: Write all other columns to properties of the same name
+    --format FORMAT: Coordinate format, one of quoted, numeric, string and
+        compact (default: quoted)
+    --layout LAYOUT: Folder layout, flat or hash (default: flat)
+    --depth N: Number of hashed subfolder levels for the hash layout (default: 2)
+    --workers N: Number of worker processes used to write notes (default: 1)
+
+Notes are never overwritten. When a note name is taken, the new note gets a
+"(n)" suffix, so importing the same file twice creates every note twice.
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from generate_test_files import CHUNK_SIZE, markdown_content, note_folder, positive_int, run_bounded
+from scan_vault import coordinate_from_value
+
+INPUT_FORMATS = ["auto", "csv", "geojson", "geojsonseq"]
+INPUT_EXTENSIONS = {
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".geojson": "geojson",
+    ".json": "geojson",
+    ".geojsonl": "geojsonseq",
+    ".geojsons": "geojsonseq",
+    ".ndjson": "geojsonseq",
+    ".jsonl": "geojsonseq",
+}
+IMPORT_FORMATS = ["quoted", "numeric", "string", "compact"]
+
+NAME_COLUMNS = ["name", "title"]
+LAT_COLUMNS = ["lat", "latitude", "y"]
+LON_COLUMNS = ["lon", "lng", "long", "longitude", "x"]
+
+# Characters that are not allowed in note names
+INVALID_NAME_CHARACTERS = re.compile(r'[\\/:*?"<>|#^\[\]\x00-\x1f]+')
+MAX_NAME_LENGTH = 200
+
+# Size of the blocks GeoJSON files are read in
+READ_SIZE = 1 << 20
+
+# Property names that can be written without quotes
+PLAIN_KEY_PATTERN = re.compile(r'[A-Za-z_][\w -]*')
+
+
+def iter_csv_rows(input_path, delimiter):
+    """Get the columns of a CSV file and an iterator over its rows as dicts."""
+    f = open(input_path, 'r', encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(f, delimiter=delimiter)
+    columns = reader.fieldnames or []
+
+    def rows():
+        with f:
+            for row in reader:
+                yield row, None
+    return columns, rows()
+
+
+def iter_json_array(f, key):
+    """Yield the items of the array under key in a JSON object, reading the file in blocks.
+
+    Only the current block and the item being decoded are kept in memory,
+    so arbitrarily large FeatureCollections can be read.
+    """
+    decoder = json.JSONDecoder()
+    start_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    separator_pattern = re.compile(r'[\s,]*')
+
+    buffer = ""
+    while True:
+        match = start_pattern.search(buffer)
+        if match:
+            break
+        block = f.read(READ_SIZE)
+        if not block:
+            raise ValueError(f'No "{key}" array found')
+        # Keep the end of the buffer in case the key is split across blocks
+        buffer = buffer[-len(key) - 16:] + block
+
+    position = match.end()
+    end_of_file = False
+    while True:
+        position = separator_pattern.match(buffer, position).end()
+        if position == len(buffer) and not end_of_file:
+            block = f.read(READ_SIZE)
+            end_of_file = not block
+            buffer = buffer[position:] + block
+            position = 0
+            continue
+        if buffer.startswith("]", position):
+            return
+        try:
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if end_of_file:
+                raise
+            # The item continues in the next block. Reading at least as much as
+            # is buffered keeps decoding of very large items linear
+            block = f.read(max(READ_SIZE, len(buffer) - position))
+            end_of_file = not block
+            buffer = buffer[position:] + block
+            position = 0
+            continue
+        yield item
+
+
+def feature_record(feature):
+    """Get the columns and the (lat, lon) of a Point geometry of a GeoJSON feature."""
+    columns = feature.get("properties") or {}
+    geometry = feature.get("geometry") or {}
+    point = None
+    if geometry.get("type") == "Point" and len(geometry.get("coordinates") or []) >= 2:
+        lon, lat = geometry["coordinates"][:2]
+        point = (lat, lon)
+    return columns, point
+
+
+def iter_geojson_features(input_path, input_format):
+    """Iterate over the features of a GeoJSON or newline-delimited GeoJSON file."""
+    with open(input_path, 'r', encoding='utf-8-sig') as f:
+        if input_format == "geojsonseq":
+            for line in f:
+                # GeoJSON text sequences start every feature with a record separator
+                line = line.strip().lstrip("\x1e")
+                if line:
+                    yield feature_record(json.loads(line))
+        else:
+            for feature in iter_json_array(f, "features"):
+                yield feature_record(feature)
+
+
+def find_column(columns, candidates):
+    """Find the first of the candidate column names, ignoring case."""
+    lowered = {column.lower(): column for column in columns}
+    for candidate in candidates:
+        if candidate in lowered:
+            return lowered[candidate]
+    return None
+
+
+def note_name(value, row_number):
+    """Turn a name column into a valid note name."""
+    name = INVALID_NAME_CHARACTERS.sub(" ", str(value) if value is not None else "")
+    name = " ".join(name.split()).lstrip(".")[:MAX_NAME_LENGTH].strip()
+    return name or f"Place {row_number}"
+
+
+def property_key(name):
+    """Quote a property name for YAML if needed."""
+    return name if PLAIN_KEY_PATTERN.fullmatch(name) else json.dumps(name, ensure_ascii=False)
+
+
+def style_value(value):
+    """Get an icon or color from a column, or None if it is empty."""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    return str(value).strip() or None
+
+
+def record_coordinates(columns, point, options):
+    """Get the (lat, lon) of a record with the rules of the plugin, or None if it would not be shown."""
+    if options["coordinates"]:
+        return coordinate_from_value(columns.get(options["coordinates"]))
+    if options["lat"]:
+        return coordinate_from_value([columns.get(options["lat"]), columns.get(options["lon"])])
+    return coordinate_from_value(list(point)) if point else None
+
+
+def write_note(output_path, folder, name, content):
+    """Write a note without overwriting existing ones. Returns whether the name had to be changed."""
+    directory = output_path / folder if folder else output_path
+    directory.mkdir(parents=True, exist_ok=True)
+    filename, suffix = name, 1
+    while True:
+        try:
+            # Exclusive creation keeps parallel workers from overwriting each other's notes
+            with open(directory / f"{filename}.md", 'x', encoding='utf-8') as f:
+                f.write(content)
+            return suffix > 1
+        except FileExistsError:
+            suffix += 1
+            filename = f"{name} ({suffix})"
+
+
+def import_batch(output_path, batch, options):
+    """Write the notes of a batch of (row number, columns, point) records and count the outcomes."""
+    counts = Counter()
+    for row_number, columns, point in batch:
+        coordinates = record_coordinates(columns, point, options)
+        if coordinates is None:
+            counts["skipped"] += 1
+            continue
+
+        properties = {}
+        for name, column in options["properties"].items():
+            value = columns.get(column)
+            if value not in (None, ""):
+                properties[property_key(name)] = value
+        if options["all_properties"]:
+            for column, value in columns.items():
+                if column not in options["mapped"] and column is not None and value not in (None, ""):
+                    properties.setdefault(property_key(column), value)
+
+        place_type = style_value(columns.get(options["type"])) if options["type"] else None
+        content = markdown_content(
+            tuple(repr(float(value)) for value in coordinates), place_type, options["format"],
+            style_value(columns.get(options["icon"])) if options["icon"] else None,
+            style_value(columns.get(options["color"])) if options["color"] else None,
+            properties,
+        )
+        name = note_name(columns.get(options["name"]) if options["name"] else None, row_number)
+        folder = note_folder(name, None, options["layout"], options["depth"])
+        counts["renamed" if write_note(output_path, folder, name, content) else "written"] += 1
+    return counts
+
+
+def iter_batches(records, size):
+    """Group records into numbered batches of the given size."""
+    numbered = ((row_number, columns, point) for row_number, (columns, point) in enumerate(records, 1))
+    while True:
+        batch = list(itertools.islice(numbered, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_places(input_path, output_dir="imported_places", input_format="auto", delimiter=None,
+                  name=None, lat=None, lon=None, coordinates=None, place_type=None, icon=None, color=None,
+                  properties=None, all_properties=False, coordinate_format="quoted", layout="flat", depth=None,
+                  workers=1):
+    """Import the places of a CSV or GeoJSON file into notes."""
+    input_path = Path(input_path)
+    if input_format == "auto":
+        input_format = INPUT_EXTENSIONS.get(input_path.suffix.lower())
+        if input_format is None:
+            raise ValueError(f"Cannot tell the format of {input_path}, use --input-format")
+
+    if input_format == "csv":
+        if delimiter is None:
+            delimiter = "\t" if input_path.suffix.lower() == ".tsv" else ","
+        columns, records = iter_csv_rows(input_path, delimiter)
+        if not coordinates and not lat:
+            lat, lon = find_column(columns, LAT_COLUMNS), find_column(columns, LON_COLUMNS)
+            if not lat or not lon:
+                raise ValueError(f"No latitude and longitude columns found in {', '.join(columns)}")
+        if name is None:
+            name = find_column(columns, NAME_COLUMNS)
+    else:
+        records = iter_geojson_features(input_path, input_format)
+        if name is None:
+            name = "name"
+
+    properties = properties or {}
+    options = {
+        "name": name,
+        "lat": lat,
+        "lon": lon,
+        "coordinates": coordinates,
+        "type": place_type,
+        "icon": icon,
+        "color": color,
+        "properties": properties,
+        "all_properties": all_properties,
+        # Columns that are written to other properties are not repeated by --all-properties
+        "mapped": {name, lat, lon, coordinates, place_type, icon, color, *properties.values()},
+        "format": coordinate_format,
+        "layout": layout,
+        "depth": (2 if layout == "hash" else 0) if depth is None else depth,
+    }
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    print(f"Importing {input_path} into {output_path}/...")
+
+    totals = Counter()
+    # Only a few batches are queued at once, so the input is never read far ahead of the notes
+    batches = ((output_path, batch, options) for batch in iter_batches(records, CHUNK_SIZE))
+    for counts in run_bounded(import_batch, batches, workers):
+        totals.update(counts)
+        rows = totals["written"] + totals["renamed"] + totals["skipped"]
+        if rows % (CHUNK_SIZE * 10) == 0:
+            print(f"  Read {rows} rows...")
+
+    imported = totals["written"] + totals["renamed"]
+    print(f"✓ Successfully imported {imported} notes into {output_path}/")
+    if totals["renamed"]:
+        print(f"  {totals['renamed']} notes got a suffix because their name was taken")
+    if totals["skipped"]:
+        print(f"  Skipped {totals['skipped']} rows without coordinates the plugin can show")
+    return totals
+
+
+def property_mapping(value):
+    """Argument type for NAME=COLUMN property mappings."""
+    name, separator, column = value.partition("=")
+    if not separator or not name.strip() or not column:
+        raise argparse.ArgumentTypeError(f"Invalid property '{value}'. Must be NAME=COLUMN")
+    return name.strip(), column
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Import places from CSV or GeoJSON into notes.")
+    parser.add_argument("input", help="CSV, GeoJSON or newline-delimited GeoJSON file")
+    parser.add_argument("--output", default="imported_places",
+                        help="Folder the notes are written to (default: imported_places)")
+    parser.add_argument("--input-format", choices=INPUT_FORMATS, default="auto",
+                        help="Format of the input (default: from the file extension)")
+    parser.add_argument("--delimiter", default=None, help="Delimiter of CSV files (default: comma, tab for .tsv)")
+    parser.add_argument("--name", default=None, help="Column used as note name (default: name or title)")
+    parser.add_argument("--lat", default=None, help="Latitude column")
+    parser.add_argument("--lon", default=None, help="Longitude column")
+    parser.add_argument("--coordinates", default=None, help='Single column with "lat, lon" coordinates')
+    parser.add_argument("--type", default=None, help="Column written to the type property")
+    parser.add_argument("--icon", default=None, help="Column written to the icon property")
+    parser.add_argument("--color", default=None, help="Column written to the color property")
+    parser.add_argument("--property", type=property_mapping, action="append", default=[],
+                        help="Write a column to a property, as NAME=COLUMN. Can be repeated")
+    parser.add_argument("--all-properties", action="store_true",
+                        help="Write all other columns to properties of the same name")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default="quoted",
+                        help="Coordinate format (default: quoted)")
+    parser.add_argument("--layout", choices=["flat", "hash"], default="flat", help="Folder layout (default: flat)")
+    parser.add_argument("--depth", type=int, default=None,
+                        help="Number of hashed subfolder levels for the hash layout (default: 2)")
+    parser.add_argument("--workers", type=positive_int, default=1,
+                        help="Number of worker processes used to write notes (default: 1)")
+    args = parser.parse_args()
+
+    if not Path(args.input).is_file():
+        parser.error(f"File not found: {args.input}")
+    if bool(args.lat) != bool(args.lon):
+        parser.error("--lat and --lon must be used together")
+    if args.coordinates and args.lat:
+        parser.error("--coordinates cannot be used with --lat and --lon")
+    if args.delimiter is not None and len(args.delimiter) != 1:
+        parser.error("--delimiter must be a single character")
+    if args.depth is not None and args.layout != "hash":
+        parser.error("--depth can only be used with the hash layout")
+    if args.depth is not None and not 1 <= args.depth <= 16:
+        parser.error("--depth must be between 1 and 16")
+
+    # Allow large text cells, e.g. descriptions
+    csv.field_size_limit(sys.maxsize)
+
+    try:
+        import_places(
+            args.input, args.output, args.input_format, args.delimiter,
+            name=args.name, lat=args.lat, lon=args.lon, coordinates=args.coordinates,
+            place_type=args.type, icon=args.icon, color=args.color,
+            properties=dict(args.property), all_properties=args.all_properties,
+            coordinate_format=args.format, layout=args.layout, depth=args.depth,
+            workers=args.workers,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+Scan a vault and report how its notes would be shown by the Obsidian Maps plugin.
+
+Coordinates are parsed with the same rules as coordinateFromValue() and
+parseCoordinate() in src/map/utils.ts, and marker icons and colors with the
+same rules as MarkerManager, so the report predicts how many markers and
+composite marker images a map view of the vault has to render.
+
+Usage:
+    python scan_vault.py VAULT [options]
+
+Arguments:
+    VAULT: Folder to scan, e.g. a vault or tests/generated_places
+
+Options:
+    --coordinates NAME: Coordinates property (default: coordinates)
+    --icon NAME: Marker icon property (default: icon)
+    --color NAME: Marker color property (default: color)
+    --cell DEGREES: Size of the grid cells used for the density histogram (default: 10)
+    --top N: Number of densest cells and most common values listed (default: 10)
+    --workers N: Number of worker processes (default: number of CPUs)
+    --json: Print the statistics as JSON instead of a report
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Files are scanned in batches so that workers return few, large results
+BATCH_SIZE = 500
+
+# Prefix accepted by JavaScript's parseFloat()
+JS_FLOAT_PATTERN = re.compile(r'[+-]?(?:Infinity|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+
+YAML_NUMBER_PATTERN = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|0x[0-9a-fA-F]+|[+-]?\.inf|\.nan', re.IGNORECASE)
+
+DEFAULT_MARKER_COLOR = "var(--bases-map-marker-background)"
+
+
+def parse_yaml_scalar(text):
+    """Parse a YAML scalar into None, a bool, a number or a string."""
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "\"'":
+        if text[0] == '"':
+            try:
+                return json.loads(text)
+            except ValueError:
+                return text[1:-1]
+        return text[1:-1].replace("''", "'")
+    # Drop trailing comments
+    text = re.sub(r'\s+#.*$', '', text)
+    if text in ("", "~", "null", "Null", "NULL"):
+        return None
+    if text in ("true", "True", "TRUE"):
+        return True
+    if text in ("false", "False", "FALSE"):
+        return False
+    if YAML_NUMBER_PATTERN.fullmatch(text):
+        lowered = text.lower()
+        if lowered.endswith(".nan"):
+            return math.nan
+        if lowered.endswith(".inf"):
+            return -math.inf if lowered.startswith("-") else math.inf
+        if lowered.startswith("0x"):
+            return int(text, 16)
+        number = float(text)
+        return int(number) if re.fullmatch(r'[+-]?\d+', text) else number
+    return text
+
+
+def split_flow_list(text):
+    """Split the items of a YAML flow list like [a, "b, c"] without parsing them."""
+    items, current, quote, depth = [], "", None, 0
+    for char in text:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "\"'":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(current)
+            current = ""
+            continue
+        current += char
+    if current.strip():
+        items.append(current)
+    return items
+
+
+def parse_yaml_value(text):
+    """Parse an inline YAML value, which is a flow list or a scalar."""
+    text = text.strip()
+    if text.startswith("[") and text.endswith("]"):
+        return [parse_yaml_value(item) for item in split_flow_list(text[1:-1])]
+    if text.startswith("{") and text.endswith("}"):
+        return {}
+    return parse_yaml_scalar(text)
+
+
+def parse_frontmatter(lines):
+    """Parse the top-level properties of YAML frontmatter lines.
+
+    This covers the property shapes Obsidian writes: scalars, flow lists and
+    block lists. Nested objects are returned as empty dicts.
+    """
+    properties = {}
+    key = None
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        if line[0] not in " \t-":
+            key, _, value = line.partition(":")
+            key = key.strip().strip("\"'")
+            properties[key] = parse_yaml_value(value) if value.strip() else None
+        elif key is not None and line.lstrip().startswith("- "):
+            if not isinstance(properties[key], list):
+                properties[key] = []
+            properties[key].append(parse_yaml_value(line.lstrip()[2:]))
+        elif key is not None and line.lstrip() == "-":
+            if not isinstance(properties[key], list):
+                properties[key] = []
+            properties[key].append(None)
+        elif key is not None and properties[key] is None:
+            properties[key] = {}
+    return properties
+
+
+def read_frontmatter(filepath):
+    """Read the frontmatter properties of a note, without reading the rest of it."""
+    lines = []
+    with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
+        if f.readline().rstrip() != "---":
+            return {}
+        for line in f:
+            if line.rstrip() == "---":
+                return parse_frontmatter(lines)
+            lines.append(line.rstrip("\n"))
+    # Unterminated frontmatter is not parsed by Obsidian
+    return {}
+
+
+def js_parse_float(text):
+    """Parse a number like JavaScript's parseFloat(), which accepts any numeric prefix."""
+    match = JS_FLOAT_PATTERN.match(text.lstrip())
+    if not match:
+        return math.nan
+    number = match.group(0)
+    if number.lstrip("+-") == "Infinity":
+        return -math.inf if number.startswith("-") else math.inf
+    return float(number)
+
+
+def js_truthy_number(number):
+    """Whether a number is truthy in JavaScript."""
+    return number is not None and number != 0 and not math.isnan(number)
+
+
+def parse_coordinate(value):
+    """Parse a coordinate like parseCoordinate(). Returns None if it is not a number."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, str):
+        number = js_parse_float(value)
+        return None if math.isnan(number) else number
+    return None
+
+
+def verify_lat_lng(lat, lng):
+    """Verify that lat/lng values are within valid ranges like verifyLatLng()."""
+    return not math.isnan(lat) and not math.isnan(lng) and -90 <= lat <= 90 and -180 <= lng <= 180
+
+
+def coordinate_from_value(value):
+    """Convert a property value to a (lat, lng) tuple like coordinateFromValue(). Returns None if invalid."""
+    lat = lng = None
+    if isinstance(value, list):
+        if len(value) >= 2:
+            lat = parse_coordinate(value[0])
+            lng = parse_coordinate(value[1])
+    elif isinstance(value, str):
+        parts = value.strip().split(",")
+        if len(parts) >= 2:
+            lat = parse_coordinate(parts[0].strip())
+            lng = parse_coordinate(parts[1].strip())
+
+    # Zero coordinates are falsy and rejected by the plugin
+    if js_truthy_number(lat) and js_truthy_number(lng) and verify_lat_lng(lat, lng):
+        return lat, lng
+    return None
+
+
+def classify_coordinates(value):
+    """Get the format of a coordinates value and the reason it is invalid, or None if it is valid."""
+    if value is None:
+        coordinate_format = "missing"
+    elif isinstance(value, list):
+        kinds = {"number" if isinstance(item, (int, float)) and not isinstance(item, bool)
+                 else "string" if isinstance(item, str) else "other" for item in value[:2]}
+        coordinate_format = "list-" + (kinds.pop() if len(kinds) == 1 else "mixed")
+        if len(value) < 2:
+            coordinate_format = "list-short"
+        elif len(value) > 2:
+            coordinate_format += "-extra"
+    elif isinstance(value, str):
+        if ", " in value:
+            coordinate_format = "string"
+        elif "," in value:
+            coordinate_format = "string-compact"
+        else:
+            coordinate_format = "string-other"
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        coordinate_format = "number"
+    else:
+        coordinate_format = "other"
+
+    if coordinate_from_value(value) is not None:
+        return coordinate_format, None
+
+    # Find out why the value was rejected
+    parts = value[:2] if isinstance(value, list) else value.strip().split(",")[:2] if isinstance(value, str) else []
+    numbers = [parse_coordinate(part.strip() if isinstance(part, str) else part) for part in parts]
+    if len(numbers) < 2:
+        reason = "unsupported"
+    elif None in numbers:
+        reason = "not-a-number"
+    elif not all(js_truthy_number(number) for number in numbers):
+        reason = "zero"
+    else:
+        reason = "out-of-range"
+    return coordinate_format, reason
+
+
+def value_to_string(value):
+    """Convert a property value to a string like Value.toString()."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, list):
+        return ", ".join(value_to_string(item) for item in value)
+    if isinstance(value, dict):
+        return "[object Object]"
+    return "" if value is None else str(value)
+
+
+def value_is_truthy(value):
+    """Whether a property value is truthy like Value.isTruthy()."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return js_truthy_number(value)
+    return bool(value)
+
+
+def marker_style(properties, icon_property, color_property):
+    """Get the icon, color and composite image key of a marker like MarkerManager."""
+    icon = properties.get(icon_property)
+    icon = value_to_string(icon).strip() if value_is_truthy(icon) else None
+    if icon in ("", "null", "undefined"):
+        icon = None
+
+    color = properties.get(color_property)
+    color = (value_to_string(color).strip() if value_is_truthy(color) else None) or DEFAULT_MARKER_COLOR
+
+    composite_key = f"marker-{icon or 'dot'}-{re.sub(r'[^a-zA-Z0-9]', '', color)}"
+    return icon, color, composite_key
+
+
+def new_statistics():
+    """Create empty scan statistics."""
+    return {
+        "files": 0,
+        "unreadable": 0,
+        "markers": 0,
+        "formats": Counter(),
+        "invalid": Counter(),
+        "bounds": None,
+        "cells": Counter(),
+        "icons": Counter(),
+        "colors": Counter(),
+        "composite_keys": Counter(),
+    }
+
+
+def merge_statistics(total, partial):
+    """Add partial statistics into total."""
+    for key, value in partial.items():
+        if key == "bounds":
+            if value is not None and total["bounds"] is not None:
+                total["bounds"] = [min(total["bounds"][0], value[0]), min(total["bounds"][1], value[1]),
+                                   max(total["bounds"][2], value[2]), max(total["bounds"][3], value[3])]
+            elif value is not None:
+                total["bounds"] = list(value)
+        else:
+            total[key] += value
+    return total
+
+
+def scan_files(filepaths, options):
+    """Scan a batch of notes and return their statistics."""
+    statistics = new_statistics()
+    cell = options["cell"]
+    for filepath in filepaths:
+        statistics["files"] += 1
+        try:
+            properties = read_frontmatter(filepath)
+        except OSError:
+            statistics["unreadable"] += 1
+            continue
+
+        value = properties.get(options["coordinates"])
+        coordinate_format, reason = classify_coordinates(value)
+        statistics["formats"][coordinate_format] += 1
+        if reason is not None:
+            if coordinate_format != "missing":
+                statistics["invalid"][reason] += 1
+            continue
+
+        lat, lng = coordinate_from_value(value)
+        statistics["markers"] += 1
+        bounds = statistics["bounds"]
+        if bounds is None:
+            statistics["bounds"] = [lat, lng, lat, lng]
+        else:
+            statistics["bounds"] = [min(bounds[0], lat), min(bounds[1], lng), max(bounds[2], lat), max(bounds[3], lng)]
+        statistics["cells"][(math.floor(lat / cell), math.floor(lng / cell))] += 1
+
+        icon, color, composite_key = marker_style(properties, options["icon"], options["color"])
+        statistics["icons"][icon] += 1
+        statistics["colors"][color] += 1
+        statistics["composite_keys"][composite_key] += 1
+    return statistics
+
+
+def find_notes(vault_path):
+    """Find all markdown notes of a vault in a stable order, skipping hidden folders like .obsidian and .trash."""
+    for root, folders, filenames in os.walk(vault_path):
+        folders[:] = sorted(folder for folder in folders if not folder.startswith("."))
+        for filename in sorted(filenames):
+            if filename.endswith(".md"):
+                yield os.path.join(root, filename)
+
+
+def scan_vault(vault_path, coordinates="coordinates", icon="icon", color="color", cell=10.0, workers=None):
+    """Scan every note of a vault in a process pool and return the merged statistics."""
+    options = {"coordinates": coordinates, "icon": icon, "color": color, "cell": cell}
+    filepaths = list(find_notes(vault_path))
+    batches = [filepaths[start:start + BATCH_SIZE] for start in range(0, len(filepaths), BATCH_SIZE)]
+
+    statistics = new_statistics()
+    if workers == 1:
+        for batch in batches:
+            merge_statistics(statistics, scan_files(batch, options))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(scan_files, batches, [options] * len(batches)):
+                merge_statistics(statistics, partial)
+    return statistics
+
+
+def statistics_to_json(statistics, cell, top):
+    """Convert scan statistics to a JSON-serializable dict."""
+    bounds = statistics["bounds"]
+    cells = statistics["cells"]
+    return {
+        "files": statistics["files"],
+        "unreadable": statistics["unreadable"],
+        "markers": statistics["markers"],
+        "formats": dict(statistics["formats"].most_common()),
+        "invalid": dict(statistics["invalid"].most_common()),
+        "bounds": dict(zip(["min_lat", "min_lng", "max_lat", "max_lng"], bounds)) if bounds else None,
+        "density": {
+            "cell_degrees": cell,
+            "cells": len(cells),
+            "max_per_cell": max(cells.values(), default=0),
+            "densest": [
+                {"lat": lat * cell, "lng": lng * cell, "markers": count}
+                for (lat, lng), count in cells.most_common(top)
+            ],
+        },
+        "icons": {"distinct": len(statistics["icons"]), "top": statistics["icons"].most_common(top)},
+        "colors": {"distinct": len(statistics["colors"]), "top": statistics["colors"].most_common(top)},
+        "composite_images": len(statistics["composite_keys"]),
+    }
+
+
+def print_report(report):
+    """Print scan statistics as a human-readable report."""
+    def histogram(title, counts, total):
+        print(f"\n{title}:")
+        for name, count in counts:
+            share = 100 * count / total if total else 0
+            print(f"  {'(none)' if name is None else str(name):<32} {count:>10}  {share:5.1f}%")
+
+    print(f"Files:    {report['files']}" + (f" ({report['unreadable']} unreadable)" if report["unreadable"] else ""))
+    print(f"Markers:  {report['markers']}")
+    histogram("Coordinate formats", report["formats"].items(), report["files"])
+    if report["invalid"]:
+        histogram("Invalid coordinates", report["invalid"].items(), report["files"])
+
+    bounds = report["bounds"]
+    if bounds:
+        print(f"\nBounds: lat {bounds['min_lat']:.5f} to {bounds['max_lat']:.5f}, "
+              f"lng {bounds['min_lng']:.5f} to {bounds['max_lng']:.5f}")
+
+    density = report["density"]
+    print(f"\nDensity ({density['cell_degrees']}° cells): {density['cells']} cells with markers, "
+          f"at most {density['max_per_cell']} markers per cell")
+    for cell in density["densest"]:
+        print(f"  lat {cell['lat']:>7.2f}, lng {cell['lng']:>8.2f}  {cell['markers']:>10}")
+
+    histogram(f"Icons ({report['icons']['distinct']} distinct)", report["icons"]["top"], report["markers"])
+    histogram(f"Colors ({report['colors']['distinct']} distinct)", report["colors"]["top"], report["markers"])
+    print(f"\nComposite marker images: {report['composite_images']}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Report how the notes of a vault would be shown on a map.")
+    parser.add_argument("vault", help="Folder to scan")
+    parser.add_argument("--coordinates", default="coordinates", help="Coordinates property (default: coordinates)")
+    parser.add_argument("--icon", default="icon", help="Marker icon property (default: icon)")
+    parser.add_argument("--color", default="color", help="Marker color property (default: color)")
+    parser.add_argument("--cell", type=float, default=10.0,
+                        help="Size of the grid cells used for the density histogram (default: 10)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="Number of densest cells and most common values listed (default: 10)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (default: number of CPUs)")
+    parser.add_argument("--json", action="store_true", help="Print the statistics as JSON instead of a report")
+    args = parser.parse_args()
+
+    if not Path(args.vault).is_dir():
+        parser.error(f"Folder not found: {args.vault}")
+    if args.cell <= 0:
+        parser.error("--cell must be positive")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be a positive integer")
+
+    statistics = scan_vault(args.vault, args.coordinates, args.icon, args.color, args.cell, args.workers)
+    report = statistics_to_json(statistics, args.cell, args.top)
+    if args.json:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Serve map tiles and style JSON from local fixtures for offline Obsidian Maps plugin testing.
+
+Usage:
+    python tile_server.py [options]
+
+Options:
+    --host HOST: Address to listen on (default: 127.0.0.1)
+    --port N: Port to listen on (default: 8080)
+    --tiles DIR: Folder with tiles in a {z}/{x}/{y}.<ext> tree. Missing tiles
+        are answered with a generated placeholder PNG (default: none)
+    --styles DIR: Folder with style JSON files, served by file name
+        (default: none)
+    --latency MS: Delay added to every request in milliseconds (default: 0)
+    --jitter MS: Random extra delay of up to this many milliseconds (default: 0)
+    --bandwidth BYTES: Total bandwidth of all responses in bytes per second,
+        0 for no limit (default: 0)
+    --error-rate FRACTION: Fraction of tile requests answered with a
+        500 error (default: 0)
+    --max-concurrency N: Number of requests served at the same time. Other
+        requests wait for a free slot, 0 for no limit (default: 0)
+    --seed N: Seed for the jitter and errors (default: random)
+    --quiet: Do not log requests
+    --mapbox-layers N: Number of layers of the generated Mapbox styles (default: 300)
+    --certfile FILE, --keyfile FILE: Serve HTTPS with this certificate and key
+
+Endpoints:
+    /tiles/{z}/{x}/{y}.<ext>: Tiles, e.g. for the "Map tiles" view option:
+        http://127.0.0.1:8080/tiles/{z}/{x}/{y}.png
+    /styles/<name>.json: Style JSON from the styles folder. The "default"
+        style is a raster style with the tiles of this server:
+        http://127.0.0.1:8080/styles/default.json
+
+Mapbox API stand-in:
+    The plugin rewrites mapbox:// URLs of styles loaded with an access_token to
+    https://api.mapbox.com (see src/mapbox-transform.ts). This server answers
+    the rewritten endpoints, so that style fetch, transform and setStyle can
+    be measured without a network:
+    /styles/v1/<user>/<style>: Style from the styles folder named <style>.json,
+        or a generated style with --mapbox-layers layers that uses mapbox://
+        sources, sprites and glyphs
+    /styles/v1/<user>/<style>/sprite[@2x].json|.png: Empty sprite
+    /fonts/v1/<user>/<fontstack>/<range>.pbf: Empty glyph range
+    /v4/<tilesets>.json: TileJSON for the tiles below
+    /v4/<tilesets>/{z}/{x}/{y}.<ext>: Empty vector tiles
+    Requests without an access_token are rejected with 401, like the real API.
+
+    Load a style through the "Map tiles" view option, e.g.
+        http://127.0.0.1:8080/styles/v1/user/streets?access_token=test
+    To also serve the rewritten sources, sprites and glyphs, run the server on
+    port 443 with a certificate for api.mapbox.com and point api.mapbox.com at
+    127.0.0.1 in the hosts file.
+"""
+
+import argparse
+import contextlib
+import json
+import random
+import ssl
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from functools import lru_cache
+from urllib.parse import parse_qs, urlsplit
+
+CONTENT_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+    ".pbf": "application/x-protobuf",
+    ".mvt": "application/vnd.mapbox-vector-tile",
+    ".json": "application/json",
+}
+
+TILE_SIZE = 256
+
+# Responses are written in blocks so that the bandwidth limit applies while sending
+WRITE_BLOCK_SIZE = 16 * 1024
+
+
+def encode_png(width, height, rows):
+    """Encode 8-bit RGB rows (bytes of width * 3) as a PNG image."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    raw = b"".join(b"\x00" + row for row in rows)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 6))
+        + chunk(b"IEND", b"")
+    )
+
+
+def placeholder_tile():
+    """Get a light gray tile with a darker border, used for missing tiles."""
+    border = bytes([160, 160, 160]) * TILE_SIZE
+    row = bytes([160, 160, 160]) + bytes([224, 224, 224]) * (TILE_SIZE - 2) + bytes([160, 160, 160])
+    return encode_png(TILE_SIZE, TILE_SIZE, [border] + [row] * (TILE_SIZE - 2) + [border])
+
+
+def default_style(base_url):
+    """Get a raster style that uses the tiles of this server."""
+    return {
+        "version": 8,
+        "sources": {
+            "local": {
+                "type": "raster",
+                "tiles": [f"{base_url}/tiles/{{z}}/{{x}}/{{y}}.png"],
+                "tileSize": TILE_SIZE,
+            },
+        },
+        "layers": [
+            {"id": "local", "type": "raster", "source": "local"},
+        ],
+    }
+
+
+@lru_cache(maxsize=None)
+def mapbox_style(username, style_id, layer_count):
+    """Generate a Mapbox style document with mapbox:// references and layer_count layers."""
+    source_layers = ["water", "landuse", "road", "building", "admin", "place_label", "poi_label", "contour"]
+    layers = [{"id": "background", "type": "background", "paint": {"background-color": "#f8f4f0"}}]
+    for i in range(layer_count - 1):
+        source_layer = source_layers[i % len(source_layers)]
+        layer = {
+            "id": f"{source_layer}-{i}",
+            "source": "composite",
+            "source-layer": source_layer,
+            "minzoom": i % 10,
+            "filter": ["all", ["==", ["geometry-type"], "Polygon"], ["match", ["get", "class"], [f"class-{i}", "other"], True, False]],
+            "layout": {},
+        }
+        kind = ["fill", "line", "symbol"][i % 3]
+        layer["type"] = kind
+        if kind == "fill":
+            layer["paint"] = {
+                "fill-color": ["interpolate", ["linear"], ["zoom"], 5, f"hsl({i % 360}, 40%, 80%)", 15, f"hsl({i % 360}, 40%, 60%)"],
+                "fill-opacity": 0.8,
+            }
+        elif kind == "line":
+            layer["layout"] = {"line-cap": "round", "line-join": "round"}
+            layer["paint"] = {
+                "line-color": f"hsl({i % 360}, 30%, 50%)",
+                "line-width": ["interpolate", ["exponential", 1.5], ["zoom"], 5, 0.5, 18, 12],
+            }
+        else:
+            layer["layout"] = {
+                "text-field": ["coalesce", ["get", "name_en"], ["get", "name"]],
+                "text-font": ["DIN Pro Medium", "Arial Unicode MS Regular"],
+                "text-size": ["interpolate", ["linear"], ["zoom"], 10, 11, 18, 16],
+                "icon-image": ["get", "maki"],
+            }
+            layer["paint"] = {"text-color": "#333333", "text-halo-color": "#ffffff", "text-halo-width": 1}
+        layers.append(layer)
+
+    return {
+        "version": 8,
+        "name": style_id,
+        "owner": username,
+        "projection": {"name": "mercator"},
+        "center": [2.35, 48.85],
+        "zoom": 4,
+        "sources": {
+            "composite": {"type": "vector", "url": "mapbox://mapbox.mapbox-streets-v8,mapbox.mapbox-terrain-v2"},
+            "satellite": {"type": "raster", "url": "mapbox://mapbox.satellite", "tileSize": 256},
+        },
+        "sprite": f"mapbox://sprites/{username}/{style_id}",
+        "glyphs": "mapbox://fonts/" + username + "/{fontstack}/{range}.pbf",
+        "layers": layers,
+    }
+
+
+class Throttle:
+    """Token bucket shared by all requests to cap the total bandwidth."""
+
+    def __init__(self, bytes_per_second):
+        self.rate = bytes_per_second
+        self.available = 0.0
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self, size):
+        """Block until size bytes may be sent."""
+        if self.rate <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            # Allow bursts of up to a quarter of a second worth of data
+            self.available = min(self.rate / 4, self.available + (now - self.updated) * self.rate)
+            self.updated = now
+            self.available -= size
+            delay = -self.available / self.rate if self.available < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+
+
+class TileRequestHandler(BaseHTTPRequestHandler):
+    """Serves tiles and styles with the latency, bandwidth and errors configured on the server."""
+
+    def do_GET(self):
+        server = self.server
+        with server.slots:
+            delay = server.latency + server.random_uniform(0, server.jitter)
+            if delay > 0:
+                time.sleep(delay)
+
+            url = urlsplit(self.path)
+            parts = [part for part in url.path.split("/") if part]
+            is_mapbox = parts[:2] in (["styles", "v1"], ["fonts", "v1"]) or parts[:1] == ["v4"]
+            if is_mapbox and not parse_qs(url.query).get("access_token"):
+                self.send_error(401, "Missing access token")
+            elif is_mapbox:
+                self.send_mapbox(parts)
+            elif len(parts) == 4 and parts[0] == "tiles":
+                self.send_tile(*parts[1:])
+            elif len(parts) == 2 and parts[0] == "styles":
+                self.send_style(parts[1])
+            else:
+                self.send_error(404, "Not found")
+
+    def send_tile(self, z, x, y):
+        server = self.server
+        stem, _, extension = y.partition(".")
+        if not (z.isdigit() and x.isdigit() and stem.isdigit()):
+            self.send_error(404, "Not found")
+            return
+        if server.random_uniform(0, 1) < server.error_rate:
+            self.send_error(500, "Injected error")
+            return
+
+        if server.tiles is not None:
+            tile_path = server.tiles / z / x / y
+            if tile_path.is_file():
+                self.send_body(tile_path.read_bytes(), CONTENT_TYPES.get(tile_path.suffix, "application/octet-stream"))
+                return
+        if extension != "png":
+            self.send_error(404, "Not found")
+            return
+        self.send_body(server.placeholder, "image/png")
+
+    def send_style(self, name):
+        server = self.server
+        if not name.endswith(".json"):
+            name += ".json"
+
+        if server.styles is not None:
+            style_path = server.styles / name
+            if style_path.is_file() and style_path.parent == server.styles:
+                self.send_body(style_path.read_bytes(), "application/json")
+                return
+        if name == "default.json":
+            self.send_body(json.dumps(default_style(self.base_url())).encode("utf-8"), "application/json")
+            return
+        self.send_error(404, "Not found")
+
+    def send_mapbox(self, parts):
+        server = self.server
+        # /styles/v1/<user>/<style>
+        if parts[0] == "styles" and len(parts) == 4:
+            if server.styles is not None:
+                style_path = server.styles / f"{parts[3]}.json"
+                if style_path.is_file() and style_path.parent == server.styles:
+                    self.send_body(style_path.read_bytes(), "application/json")
+                    return
+            style = mapbox_style(parts[2], parts[3], server.mapbox_layers)
+            self.send_body(json.dumps(style).encode("utf-8"), "application/json")
+        # /styles/v1/<user>/<style>/sprite[@2x].json|.png
+        elif parts[0] == "styles" and len(parts) == 5 and parts[4].startswith("sprite"):
+            if parts[4].endswith(".png"):
+                self.send_body(encode_png(1, 1, [bytes([0, 0, 0])]), "image/png")
+            else:
+                self.send_body(b"{}", "application/json")
+        # /fonts/v1/<user>/<fontstack>/<range>.pbf, an empty glyph set
+        elif parts[0] == "fonts" and len(parts) == 5:
+            self.send_body(b"", "application/x-protobuf")
+        # /v4/<tilesets>.json
+        elif len(parts) == 2 and parts[1].endswith(".json"):
+            tilesets = parts[1][:-len(".json")]
+            token = parse_qs(urlsplit(self.path).query)["access_token"][0]
+            tilejson = {
+                "tilejson": "2.2.0",
+                "id": tilesets,
+                "scheme": "xyz",
+                "minzoom": 0,
+                "maxzoom": 16,
+                "bounds": [-180, -85.0511, 180, 85.0511],
+                "tiles": [f"{self.base_url()}/v4/{tilesets}/{{z}}/{{x}}/{{y}}.vector.pbf?access_token={token}"],
+                "vector_layers": [{"id": layer, "fields": {}} for layer in
+                                  ["water", "landuse", "road", "building", "admin", "place_label", "poi_label", "contour"]],
+            }
+            self.send_body(json.dumps(tilejson).encode("utf-8"), "application/json")
+        # /v4/<tilesets>/{z}/{x}/{y}.<ext>, an empty vector tile
+        elif len(parts) == 5:
+            self.send_body(b"", "application/x-protobuf")
+        else:
+            self.send_error(404, "Not found")
+
+    def base_url(self):
+        """Get the URL of this server as seen by the client."""
+        server = self.server
+        scheme = "https" if server.tls else "http"
+        return f"{scheme}://{self.headers.get('Host') or '%s:%d' % server.server_address[:2]}"
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for offset in range(0, len(body), WRITE_BLOCK_SIZE):
+            block = body[offset:offset + WRITE_BLOCK_SIZE]
+            self.server.throttle.wait(len(block))
+            self.wfile.write(block)
+
+    def send_response(self, code, message=None):
+        # Error responses need the CORS header as well, so that they are not reported as CORS failures
+        super().send_response(code, message)
+        self.send_header("Access-Control-Allow-Origin", "*")
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class TileServer(ThreadingHTTPServer):
+    """HTTP server holding the fixtures and the injected latency, bandwidth and errors."""
+
+    daemon_threads = True
+
+    def __init__(self, address, tiles=None, styles=None, latency=0.0, jitter=0.0, bandwidth=0,
+                 error_rate=0.0, max_concurrency=0, seed=None, quiet=False, mapbox_layers=300,
+                 certfile=None, keyfile=None):
+        super().__init__(address, TileRequestHandler)
+        self.tls = certfile is not None
+        if self.tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.socket = context.wrap_socket(self.socket, server_side=True)
+        self.tiles = Path(tiles).resolve() if tiles else None
+        self.styles = Path(styles).resolve() if styles else None
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.quiet = quiet
+        self.mapbox_layers = mapbox_layers
+        self.throttle = Throttle(bandwidth)
+        self.slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else contextlib.nullcontext()
+        self.placeholder = placeholder_tile()
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+
+    def random_uniform(self, low, high):
+        """Draw from the seeded generator, which is shared by all request threads."""
+        if high <= low:
+            return low
+        with self.random_lock:
+            return self.random.uniform(low, high)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Serve map tiles and style JSON from local fixtures.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument("--tiles", default=None, help="Folder with tiles in a {z}/{x}/{y}.<ext> tree")
+    parser.add_argument("--styles", default=None, help="Folder with style JSON files")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Delay added to every request in milliseconds (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Random extra delay of up to this many milliseconds (default: 0)")
+    parser.add_argument("--bandwidth", type=int, default=0,
+                        help="Total bandwidth in bytes per second, 0 for no limit (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of tile requests answered with a 500 error (default: 0)")
+    parser.add_argument("--max-concurrency", type=int, default=0,
+                        help="Number of requests served at the same time, 0 for no limit (default: 0)")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for the jitter and errors (default: random)")
+    parser.add_argument("--quiet", action="store_true", help="Do not log requests")
+    parser.add_argument("--mapbox-layers", type=int, default=300,
+                        help="Number of layers of the generated Mapbox styles (default: 300)")
+    parser.add_argument("--certfile", default=None, help="Certificate for serving HTTPS")
+    parser.add_argument("--keyfile", default=None, help="Private key for serving HTTPS")
+    args = parser.parse_args()
+
+    if args.latency < 0 or args.jitter < 0 or args.bandwidth < 0 or args.max_concurrency < 0:
+        parser.error("--latency, --jitter, --bandwidth and --max-concurrency must not be negative")
+    if not 0 <= args.error_rate <= 1:
+        parser.error("--error-rate must be between 0 and 1")
+    if args.mapbox_layers < 1:
+        parser.error("--mapbox-layers must be at least 1")
+    if args.keyfile is not None and args.certfile is None:
+        parser.error("--keyfile requires --certfile")
+    for folder in [args.tiles, args.styles]:
+        if folder is not None and not Path(folder).is_dir():
+            parser.error(f"Folder not found: {folder}")
+
+    server = TileServer(
+        (args.host, args.port), tiles=args.tiles, styles=args.styles,
+        latency=args.latency / 1000, jitter=args.jitter / 1000, bandwidth=args.bandwidth,
+        error_rate=args.error_rate, max_concurrency=args.max_concurrency, seed=args.seed, quiet=args.quiet,
+        mapbox_layers=args.mapbox_layers, certfile=args.certfile, keyfile=args.keyfile,
+    )
+    base_url = f"{'https' if server.tls else 'http'}://{args.host}:{server.server_address[1]}"
+    print(f"Serving tiles at {base_url}/tiles/{{z}}/{{x}}/{{y}}.png")
+    print(f"Serving styles at {base_url}/styles/<name>.json, e.g. {base_url}/styles/default.json")
+    print(f"Serving Mapbox styles at {base_url}/styles/v1/<user>/<style>?access_token=<token>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()